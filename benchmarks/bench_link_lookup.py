@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compara as chamadas WebDriver necessárias para achar o link do processo.
+
+Abre a página de resultados salva em ``fixtures/resultado_pesquisa.html`` em um
+Chrome headless e conta os comandos enviados ao chromedriver pela varredura
+antiga (``find_elements('//a')`` + ``.text``/``.is_displayed()`` por âncora) e
+pela busca atual em um único ``execute_script``.
+
+Uso:
+    python benchmarks/bench_link_lookup.py [--chromedriver CAMINHO] [--chrome-binary CAMINHO]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+
+from sei_aneel.browser import localizar_link_processo
+from sei_aneel.config import load_config
+
+FIXTURE = Path(__file__).with_name("fixtures") / "resultado_pesquisa.html"
+ALVO = "48500002183202469"
+
+
+def varredura_antiga(driver, alvo):
+    """Algoritmo anterior de ``pesquisar_e_entrar_processo``."""
+    for link in driver.find_elements(By.XPATH, "//a"):
+        texto = link.text.strip()
+        if link.is_displayed() and re.sub(r"\D", "", texto) == alvo:
+            return link, texto
+    return None
+
+
+def medir(driver, funcao):
+    """Executa ``funcao`` contando os comandos WebDriver emitidos."""
+    original = driver.execute
+    contagem = [0]
+
+    def contar(*args, **kwargs):
+        contagem[0] += 1
+        return original(*args, **kwargs)
+
+    driver.execute = contar
+    try:
+        inicio = time.perf_counter()
+        resultado = funcao(driver, ALVO)
+        duracao = time.perf_counter() - inicio
+    finally:
+        driver.execute = original
+    return resultado, contagem[0], duracao
+
+
+def main():
+    paths = load_config().get("paths", {})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chromedriver", default=paths.get("chromedriver", "/usr/bin/chromedriver"))
+    parser.add_argument("--chrome-binary", default=paths.get("chrome_binary"))
+    args = parser.parse_args()
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if args.chrome_binary:
+        options.binary_location = args.chrome_binary
+    driver = webdriver.Chrome(service=Service(executable_path=args.chromedriver), options=options)
+    try:
+        driver.get(FIXTURE.resolve().as_uri())
+        print(f"Âncoras na página: {len(driver.find_elements(By.TAG_NAME, 'a'))}")
+        for nome, funcao in (("antes (varredura)", varredura_antiga), ("depois (execute_script)", localizar_link_processo)):
+            resultado, chamadas, duracao = medir(driver, funcao)
+            texto = resultado[1] if resultado else "não encontrado"
+            print(f"{nome:<25} {chamadas:>5} chamadas WebDriver  {duracao * 1000:8.1f} ms  -> {texto}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Compara a vazão (imagens/s) dos backends de OCR local de captcha.
+
+Reconhece o mesmo conjunto de imagens com o backend ``subprocess`` (um
+processo ``tesseract`` por imagem) e, se instalado, com o ``tesserocr``
+(libtesseract carregada uma única vez), com pré-processamento ``simples``
+e ``multi`` (variantes + votação).  Sem ``--imagens``, usa as amostras
+salvas com ``captcha.debug_save`` em ``temp/`` ou, na falta delas, captchas
+sintéticos gerados com PIL.
+
+Uso:
+    python benchmarks/bench_ocr.py [--imagens DIR] [--repeticoes N] [--tesseract CAMINHO]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image, ImageDraw, ImageFont
+
+from sei_aneel import ocr
+from sei_aneel.config import load_config
+
+AMOSTRAS_PADRAO = Path("/opt/sei-aneel/temp")
+
+
+def sinteticas(quantidade):
+    """Imagens com 4 caracteres aleatórios e um pouco de ruído."""
+    fonte = ImageFont.load_default()
+    imagens = []
+    for _ in range(quantidade):
+        img = Image.new("L", (120, 40), 255)
+        desenho = ImageDraw.Draw(img)
+        texto = "".join(random.choices(string.ascii_uppercase + string.digits, k=4))
+        desenho.text((20, 12), " ".join(texto), fill=0, font=fonte)
+        for _ in range(60):
+            desenho.point((random.randrange(120), random.randrange(40)), fill=random.randrange(256))
+        imagens.append(ocr.para_png(img.resize((240, 80))))
+    return imagens
+
+
+def carregar(diretorio):
+    return [arquivo.read_bytes() for arquivo in sorted(diretorio.glob("*.png"))]
+
+
+def medir(imagens, repeticoes):
+    ocr.reconhecer(imagens[0])  # aquece (carrega o modelo no tesserocr)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for imagem in imagens:
+            ocr.reconhecer(imagem)
+    return len(imagens) * repeticoes / (time.perf_counter() - inicio)
+
+
+def main():
+    paths = load_config().get("paths", {})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imagens", type=Path, help="Diretório com captchas .png")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tesseract", default=paths.get("tesseract", "tesseract"))
+    args = parser.parse_args()
+
+    ocr.tesseract_cmd = args.tesseract
+    diretorio = args.imagens or AMOSTRAS_PADRAO
+    imagens = carregar(diretorio) if diretorio.is_dir() else []
+    origem = str(diretorio)
+    if not imagens:
+        imagens = sinteticas(20)
+        origem = "sintéticas"
+    print(f"{len(imagens)} imagens ({origem}) x {args.repeticoes} repetições")
+
+    backends = ["subprocess"] + (["tesserocr"] if ocr.tesserocr is not None else [])
+    modos = ["simples"] + (["multi"] if ocr.captcha_preprocess is not None else [])
+    for nome in backends:
+        ocr.backend = nome
+        for modo in modos:
+            ocr.preprocessamento = modo
+            try:
+                print(f"{nome:<12} {modo:<8} {medir(imagens, args.repeticoes):8.1f} imagens/s")
+            except ocr.OCRError as e:
+                print(f"{nome:<12} {modo:<8} indisponível: {e}")
+    if ocr.tesserocr is None:
+        print("tesserocr    não instalado (pip install tesserocr)")
+
+
+if __name__ == "__main__":
+    main()
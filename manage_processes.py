@@ -9,6 +9,7 @@ import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
 from sei_aneel.config import load_config
+from sei_aneel.quota import ESCRITA, LEITURA, cota_planilha
 
 
 def connect_sheet(conf):
@@ -20,7 +21,9 @@ def connect_sheet(conf):
                  'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, scope)
         client = gspread.authorize(creds)
-        return client.open(sheet_name).worksheet(worksheet_name)
+        # Abrir a planilha e depois a aba são duas requisições de leitura
+        planilha = cota_planilha.chamar(lambda: client.open(sheet_name), LEITURA)
+        return cota_planilha.chamar(lambda: planilha.worksheet(worksheet_name), LEITURA)
     except Exception as e:
         print(f"Erro ao conectar à planilha: {e}")
         raise
@@ -31,27 +34,27 @@ def normalize(num: str) -> str:
 
 
 def add_process(sheet, numero):
-    sheet.append_row([numero, '', '', '', '', '', '', '', '', '', ''])
+    cota_planilha.chamar(lambda: sheet.append_row([numero, '', '', '', '', '', '', '', '', '', '']), ESCRITA)
     print(f'Processo {numero} adicionado.')
 
 
 def remove_process(sheet, numero):
-    col = sheet.col_values(1)
+    col = cota_planilha.chamar(lambda: sheet.col_values(1), LEITURA)
     numero_norm = normalize(numero)
     for idx, val in enumerate(col[1:], start=2):
         if normalize(val) == numero_norm:
-            sheet.delete_rows(idx)
+            cota_planilha.chamar(lambda: sheet.delete_rows(idx), ESCRITA)
             print(f'Processo {numero} removido.')
             return
     print('Processo não encontrado.')
 
 
 def update_process(sheet, old, new):
-    col = sheet.col_values(1)
+    col = cota_planilha.chamar(lambda: sheet.col_values(1), LEITURA)
     old_norm = normalize(old)
     for idx, val in enumerate(col[1:], start=2):
         if normalize(val) == old_norm:
-            sheet.update_acell(f'A{idx}', new)
+            cota_planilha.chamar(lambda: sheet.update_acell(f'A{idx}', new), ESCRITA)
             print(f'Processo {old} atualizado para {new}.')
             return
     print('Processo não encontrado.')
@@ -65,6 +68,10 @@ def main():
     args = parser.parse_args()
 
     conf = load_config()
+    cota_planilha.configurar(
+        conf.get('google_drive', {}).get('read_quota_per_minute', 60),
+        conf.get('google_drive', {}).get('write_quota_per_minute', 60),
+    )
     sheet = connect_sheet(conf)
 
     if args.action == 'add':
@@ -11,7 +11,7 @@ import subprocess
 import sys
 import json
 import os
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 from pathlib import Path
 import argparse
 from datetime import datetime, timedelta
@@ -31,28 +31,60 @@ from sei_aneel.email_utils import (
 from sei_aneel.ui import InteractiveUI
 from sei_aneel.progress import ProgressTracker
 from sei_aneel.scheduler import ensure_cron
+from sei_aneel.workers import WorkerPool
+from sei_aneel.timing import latencias
+from sei_aneel.browser import (
+    bloquear_recursos,
+    configurar_opcoes_enxutas,
+    localizar_link_processo,
+    medir_rss_navegador,
+)
+from sei_aneel.process_state import ProcessStateStore
+from sei_aneel.quota import ESCRITA, LEITURA, cota_planilha
+from sei_aneel.sheet_mirror import EspelhoPlanilha
+from sei_aneel.checkpoint import RunCheckpoint
+from sei_aneel.captcha_pipeline import CaptchaPipeline
+from sei_aneel.circuit_breaker import CircuitBreaker, CircuitoAberto
+from sei_aneel.captcha_stats import estatisticas_captcha
+from sei_aneel.captcha_prefetch import CaptchaPrefetch
+from sei_aneel.captcha_samples import CaptchaSampleStore
+from sei_aneel import ocr, retry
+try:  # modelo local de captcha, exige NumPy
+    from sei_aneel import captcha_model
+except Exception:  # pragma: no cover - depende do ambiente
+    captcha_model = None
+from sei_aneel.http_engine import URL_PESQUISA, HttpEngineError, SEIHttpClient, criar_adaptador
+from sei_aneel.sei_parser import (
+    ParserError,
+    buscar_interessados_html,
+    captcha_rejeitado,
+    extrair_link_documento,
+    impressao_andamentos,
+    parse_pagina_processo,
+)
 
 # Inicializa colorama para Windows
 colorama.init(autoreset=True)
 
+# Status de processamento considerados sucesso ("inalterado" = sem novos andamentos)
+STATUS_SUCESSO = ("atualizado", "inserido", "processado", "inalterado")
+
 import twocaptcha
 
+import base64
 import time
 import re
 import csv
 import html
 import gspread
-import pytesseract
 import smtplib
 import platform
 import logging
 import shutil
-from urllib.parse import urljoin
 from itertools import zip_longest
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formatdate
-from PIL import Image, ImageOps, ImageFilter
 from oauth2client.service_account import ServiceAccountCredentials
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -62,6 +94,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 
 class KeyboardHandler:
     """Gerenciador de entradas de teclado"""
@@ -240,14 +273,18 @@ def configurar_paths(config: ConfigManager) -> Dict[str, Optional[str]]:
             "chrome_binary": paths_config.get('chrome_binary', "/usr/bin/chromium-browser")
         }
 
-def operacao_com_retry(func, max_retries: int = 3, delay: float = 2, logger=None) -> Any:
+def operacao_com_retry(func, operacao: str = "planilha", logger=None) -> Any:
     """
-    Executa uma função com retry automático em caso de falha.
+    Executa uma função com retry conforme a política de ``operacao``.
+    
+    A espera entre tentativas depende da classe do erro (cota, rede,
+    elemento ausente...) e usa jitter; o número de tentativas e o tempo
+    total são limitados por operação e pelo prazo da execução (ver
+    :mod:`sei_aneel.retry`).
     
     Args:
         func: Função a ser executada
-        max_retries: Número máximo de tentativas
-        delay: Delay inicial entre tentativas (aumenta exponencialmente)
+        operacao: Nome da política em ``retry.POLITICAS``
         logger: Logger para registrar tentativas
     
     Returns:
@@ -256,23 +293,7 @@ def operacao_com_retry(func, max_retries: int = 3, delay: float = 2, logger=None
     Raises:
         Exception: Se todas as tentativas falharem
     """
-    last_exception = None
-    for tentativa in range(max_retries):
-        try:
-            return func()
-        except Exception as e:
-            last_exception = e
-            if tentativa == max_retries - 1:
-                if logger:
-                    logger.error(f"Falha após {max_retries} tentativas: {e}")
-                raise
-            if logger:
-                logger.warning(f"Erro na tentativa {tentativa+1}/{max_retries}, tentando novamente em {delay}s: {e}")
-            time.sleep(delay)
-            delay *= 2
-    
-    # Esta linha nunca deve ser alcançada, mas é boa prática
-    raise last_exception
+    return retry.executar(func, operacao, logger=logger)
 
 def validar_configuracoes(config: ConfigManager, paths: Dict[str, str], logger) -> bool:
     """
@@ -327,10 +348,81 @@ def normalizar_numero(numero: str) -> str:
     """Remove caracteres não numéricos do número do processo"""
     return re.sub(r'\D', '', numero or "")
 
+def criar_pipeline_captcha(config: ConfigManager, logger) -> CaptchaPipeline:
+    """Cria o pipeline assíncrono do 2captcha compartilhado pelos workers"""
+    api_key = config.get('twocaptcha.api_key')
+    if not api_key:
+        raise ValueError("Chave API do 2captcha é obrigatória")
+    return CaptchaPipeline(
+        twocaptcha.TwoCaptcha(api_key),
+        logger,
+        atraso_inicial=config.get('twocaptcha.initial_delay', 5),
+        intervalo=config.get('twocaptcha.polling_interval', 2),
+        timeout=config.get('twocaptcha.timeout', 120),
+        disjuntor=CircuitBreaker(
+            "2captcha",
+            limite_falhas=config.get('twocaptcha.breaker_failures', 3),
+            intervalo_sonda=config.get('twocaptcha.breaker_probe_interval', 60),
+            logger=logger,
+        ),
+    )
+
+def verificar_saldo_captcha(config: ConfigManager, pipeline: CaptchaPipeline, logger) -> None:
+    """Consulta o saldo do 2captcha uma vez no início, se ele estiver entre os solvers"""
+    solvers = config.get('captcha.solvers')
+    if solvers and '2captcha' not in solvers:
+        return
+    if not config.get('twocaptcha.check_balance', True):
+        return
+    pipeline.verificar_saldo(config.get('twocaptcha.min_balance', 0))
+
+def abrir_amostras_captcha(config: ConfigManager, data_dir: Path, logger) -> Optional[CaptchaSampleStore]:
+    """Abre o registro de amostras de captcha e remove as antigas"""
+    try:
+        amostras = CaptchaSampleStore(data_dir / "captcha_samples.sqlite", logger)
+        removidas = amostras.podar(config.get('captcha.sample_retention_days', 90))
+        if removidas:
+            logger.info(f"{removidas} amostras de captcha antigas removidas")
+        return amostras
+    except Exception as e:
+        logger.warning(f"Registro de amostras de captcha indisponível: {e}")
+        return None
+
+def carregar_modelo_captcha(config: ConfigManager, logger) -> None:
+    """Carrega o modelo local de captcha uma única vez, se ``model`` estiver em ``captcha.solvers``"""
+    if 'model' not in (config.get('captcha.solvers') or []):
+        return
+    try:
+        if captcha_model is None:
+            raise RuntimeError("NumPy não está instalado")
+        modelo = captcha_model.obter_modelo(config.get('captcha.model_path'))
+        logger.info(f"Modelo de captcha carregado: {len(modelo.rotulos)} caracteres de referência")
+    except Exception as e:
+        logger.warning(f"Modelo de captcha indisponível: {e}")
+
+def criar_prefetch_captcha(config: ConfigManager, captcha_handler, logger,
+                           ha_proximo: Optional[Callable[[], bool]] = None) -> Optional[CaptchaPrefetch]:
+    """Resolução antecipada do próximo captcha, conforme ``execution.captcha_prefetch``
+
+    ``ha_proximo`` indica se ainda há processo na fila; sem ele o captcha é
+    sempre antecipado.
+    """
+    if not config.get('execution.captcha_prefetch', True):
+        return None
+    return CaptchaPrefetch(
+        captcha_handler.resolver_antecipado,
+        ttl=config.get('execution.captcha_prefetch_ttl', 120),
+        logger=logger,
+        ha_proximo=ha_proximo,
+        ao_usar=captcha_handler.usar_antecipado,
+    )
+
 class CaptchaHandler:
     """Gerenciador de resolução de CAPTCHA"""
     
-    def __init__(self, driver, config: ConfigManager, logger, ui: InteractiveUI = None):
+    def __init__(self, driver, config: ConfigManager, logger, ui: Optional[InteractiveUI],
+                 pipeline: CaptchaPipeline,
+                 amostras: Optional[CaptchaSampleStore] = None):
         self.driver = driver
         self.config = config
         self.logger = logger
@@ -341,169 +433,405 @@ class CaptchaHandler:
             self.logger.error("ERRO: Chave API do 2captcha não configurada")
             raise ValueError("Chave API do 2captcha é obrigatória")
         
-        self.solver = twocaptcha.TwoCaptcha(api_key)
+        # Pipeline (poller e disjuntor do 2captcha) compartilhado entre workers
+        if pipeline is None:
+            raise ValueError("CaptchaHandler exige o pipeline de captcha compartilhado")
+        self.pipeline = pipeline
         
-        # Ajusta temp_dir baseado no SO
+        # Ajusta temp_dir baseado no SO; só é usado com captcha.debug_save
         if platform.system() == "Windows":
             self.temp_dir = Path(os.getcwd()) / "temp"
         else:
             self.temp_dir = Path("/opt/sei-aneel/temp")
         
-        self.temp_dir.mkdir(exist_ok=True)
-
-    def ocr_captcha_pil(self, img_path: str) -> str:
+        self.debug_save = config.get('captcha.debug_save', False)
+        self.estrategia = config.get('captcha.strategy', 'local_first')
+        self.solvers = list(config.get('captcha.solvers') or
+                            (['tesseract', '2captcha'] if self.estrategia == 'local_first' else ['2captcha']))
+        self.confianca_minima = config.get('captcha.min_confidence', 75)
+        self.confianca_minima_modelo = config.get('captcha.model_min_confidence', 80)
+        self.caminho_modelo = config.get('captcha.model_path')
+        self.tamanho_captcha = config.get('captcha.length')
+        self.caracteres_captcha = config.get('captcha.charset') or ocr.CARACTERES
+        # Registro das respostas e do retorno do SEI (opcional)
+        self.amostras = amostras
+        # Origem da última resposta entregue ao SEI: (solver, id no 2captcha,
+        # confiança, id da amostra)
+        self._ultima_resposta = None
+        # Solver local cuja última resposta o SEI recusou; é pulado na próxima tentativa
+        self._pular = None
+        self.wait_timeout = config.get('execution.wait_timeout', 20)
+        self.captcha_wait_timeout = config.get('execution.captcha_wait_timeout', 10)
+
+    def ocr_captcha_pil(self, captcha_bytes: bytes) -> str:
         """
-        Processa imagem de captcha usando OCR local com otimizações.
+        Processa imagem de captcha usando OCR local, inteiramente em memória.
         
         Args:
-            img_path: Caminho para a imagem do captcha
+            captcha_bytes: Conteúdo PNG/JPEG da imagem do captcha
             
         Returns:
             Texto extraído do captcha
         """
         try:
-            img = Image.open(img_path)
-            # Pipeline de processamento de imagem otimizado
-            img = img.convert('L')  # Converte para escala de cinza
-            img = ImageOps.autocontrast(img)  # Melhora contraste
-            
-            # Binarização com threshold adaptativo
-            threshold = 130
-            img = img.point(lambda x: 255 if x > threshold else 0)
-            
-            # Filtro para reduzir ruído
-            img = img.filter(ImageFilter.MedianFilter(size=3))
-            
-            # Configuração otimizada do Tesseract
-            ocr_config = r'--psm 8 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
-            captcha_text = pytesseract.image_to_string(img, config=ocr_config)
-            
-            return captcha_text.strip()
+            return ocr.ocr_captcha(captcha_bytes)
         except Exception as e:
             self.logger.error(f"Erro no OCR local: {e}")
             return ""
 
+    def salvar_amostra(self, captcha_bytes: bytes, tentativa: int) -> None:
+        """Grava a imagem em ``temp_dir`` (modo de depuração/coleta de amostras)"""
+        try:
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
+            nome = f"captcha_{datetime.now():%Y%m%d_%H%M%S_%f}_{threading.get_ident()}_{tentativa}.png"
+            (self.temp_dir / nome).write_bytes(captcha_bytes)
+        except Exception as e:
+            self.logger.warning(f"Erro ao salvar amostra de captcha: {e}")
+
+    def formato_valido(self, texto: str) -> bool:
+        """Confere tamanho e caracteres esperados para a resposta do captcha"""
+        if not texto:
+            return False
+        if self.tamanho_captcha:
+            if len(texto) != self.tamanho_captcha:
+                return False
+        elif len(texto) < 4:
+            return False
+        return all(c in self.caracteres_captcha for c in texto)
+
+    def _entregar(self, estrategia: str, texto: str, captcha_bytes: bytes, inicio: float,
+                  captcha_id: Optional[str] = None, confianca: Optional[float] = None) -> Tuple[str, tuple]:
+        """Resposta e sua origem, guardada (com a amostra) até o retorno do SEI"""
+        amostra_id = None
+        if self.amostras:
+            amostra_id = self.amostras.registrar(
+                captcha_bytes, estrategia, texto, time.perf_counter() - inicio, confianca
+            )
+        return texto, (estrategia, captcha_id, confianca, amostra_id)
+
+    def _aceitar_local(self, solver: str, texto: str, confianca: float, minima: float,
+                       captcha_bytes: bytes, inicio: float) -> Tuple[str, Optional[tuple]]:
+        """Entrega a resposta de um solver local se formato e confiança bastarem"""
+        if self.formato_valido(texto) and confianca >= minima:
+            if self.ui:
+                print(f"{Fore.GREEN}  ✅ Captcha resolvido via {solver}: {texto}")
+            self.logger.info(f"Captcha resolvido via {solver}: {texto} (confiança {confianca:.0f})")
+            return self._entregar(solver, texto, captcha_bytes, inicio, confianca=confianca)
+        estatisticas_captcha.registrar_escalada()
+        self.logger.info(f"{solver} inconclusivo ({texto!r}, confiança {confianca:.0f}); tentando o próximo solver")
+        return "", None
+
+    def _ler_ocr(self, captcha_bytes: bytes) -> Optional[Tuple[str, float]]:
+        """Texto e confiança do OCR local; ``None`` se o OCR falhar"""
+        try:
+            return ocr.reconhecer(captcha_bytes)
+        except Exception as e:
+            self.logger.warning(f"Erro no OCR local: {e}")
+            return None
+
+    def _resolver_local(self, captcha_bytes: bytes, leitura: Optional[Tuple[str, float]],
+                        inicio: float) -> Tuple[str, Optional[tuple]]:
+        """OCR local; retorna a resposta só se a confiança for suficiente"""
+        if leitura is None:
+            return "", None
+        texto, confianca = leitura
+        return self._aceitar_local("tesseract", texto, confianca, self.confianca_minima, captcha_bytes, inicio)
+
+    def _resolver_modelo(self, captcha_bytes: bytes) -> Tuple[str, Optional[tuple]]:
+        """Modelo k-NN treinado com as amostras; desativado se não puder ser carregado"""
+        inicio = time.perf_counter()
+        try:
+            if captcha_model is None:
+                raise RuntimeError("NumPy não está instalado")
+            modelo = captcha_model.obter_modelo(self.caminho_modelo)
+            texto, confianca = modelo.reconhecer(captcha_bytes, self.tamanho_captcha)
+        except Exception as e:
+            self.logger.warning(f"Modelo de captcha indisponível: {e}; removido da lista de solvers")
+            self.solvers = [s for s in self.solvers if s != 'model']
+            return "", None
+        return self._aceitar_local("model", texto, confianca, self.confianca_minima_modelo, captcha_bytes, inicio)
+
+    def _resolver_2captcha(self, captcha_bytes: bytes) -> Optional[Tuple[str, Optional[tuple]]]:
+        """Resolve pelo 2captcha; retorna ``None`` se o serviço falhar"""
+        # A espera pela resposta fica a cargo da thread de consulta do
+        # pipeline, compartilhada com os demais workers
+        try:
+            if self.ui:
+                print(f"{Fore.CYAN}  🌐 Enviando para 2captcha...")
+            inicio = time.perf_counter()
+            future = self.pipeline.enviar(base64.b64encode(captcha_bytes).decode('ascii'))
+            captcha_text = future.result(timeout=self.pipeline.timeout + self.pipeline.intervalo)
+        except CircuitoAberto as e:
+            if self.ui:
+                print(f"{Fore.YELLOW}  ⚠️  2captcha indisponível, usando solver local")
+            self.logger.debug(str(e))
+            return None
+        except Exception as e:
+            if self.ui:
+                print(f"{Fore.YELLOW}  ⚠️  2captcha falhou")
+            self.logger.warning(f"2captcha falhou: {e}")
+            return None
+        if captcha_text and len(captcha_text) >= 4:
+            if self.ui:
+                print(f"{Fore.GREEN}  ✅ Captcha resolvido: {captcha_text}")
+            self.logger.info(f"Captcha resolvido via 2captcha: {captcha_text}")
+            return self._entregar("2captcha", captcha_text, captcha_bytes, inicio, captcha_id=future.captcha_id)
+        return "", None
+
+    def resolver_imagem(self, captcha_bytes: bytes, tentativa: int = 1) -> str:
+        """Resolve uma imagem para envio imediato (ver :meth:`_resolver`)
+
+        A origem da resposta fica guardada para :meth:`registrar_resultado`.
+        """
+        pular, self._pular = self._pular, None
+        texto, self._ultima_resposta = self._resolver(captcha_bytes, tentativa, pular)
+        return texto
+
+    def resolver_antecipado(self, captcha_bytes: bytes, tentativa: int = 1) -> Tuple[str, Optional[tuple]]:
+        """Resolve uma imagem em segundo plano, sem alterar o estado do handler
+
+        Retorna a resposta e sua origem; a origem só passa a valer em
+        :meth:`usar_antecipado`, quando a resposta é de fato usada. Assim uma
+        resolução antecipada abandonada não se confunde com a atual.
+        """
+        return self._resolver(captcha_bytes, tentativa, self._pular)
+
+    def usar_antecipado(self, origem: Optional[tuple]) -> None:
+        """Registra a origem de uma resposta antecipada que será enviada ao SEI"""
+        self._pular = None
+        self._ultima_resposta = origem
+
+    def _resolver(self, captcha_bytes: bytes, tentativa: int,
+                  pular: Optional[str]) -> Tuple[str, Optional[tuple]]:
+        """
+        Resolve uma imagem de captcha percorrendo ``captcha.solvers`` em ordem.
+        
+        ``model`` (k-NN de :mod:`sei_aneel.captcha_model`) e ``tesseract`` só
+        respondem quando o formato e a confiança são suficientes; ``2captcha``
+        responde sempre que o serviço funcionar. Um solver local cuja última
+        resposta foi rejeitada pelo SEI (``pular``) é pulado uma vez. Sem
+        ``captcha.solvers``, a ordem vem de ``captcha.strategy``. Se o
+        2captcha falhar e nenhum outro solver responder, o OCR local é usado
+        sem limite de confiança.
+        
+        Args:
+            captcha_bytes: Conteúdo PNG/JPEG da imagem do captcha
+            tentativa: Número da tentativa (usado no nome da amostra salva)
+            pular: Solver local a pular nesta resolução
+            
+        Returns:
+            Texto do captcha (vazio se não foi possível resolver) e sua origem
+        """
+        if self.debug_save:
+            self.salvar_amostra(captcha_bytes, tentativa)
+        
+        falha_servico = False
+        # Leitura do OCR local, reaproveitada pelo fallback sem limite de confiança
+        leitura_ocr: Optional[Tuple[str, float]] = None
+        ocr_lido = False
+        for solver in list(self.solvers):
+            if solver == pular:
+                continue
+            if solver == 'model':
+                resposta = self._resolver_modelo(captcha_bytes)
+            elif solver == 'tesseract':
+                inicio = time.perf_counter()
+                leitura_ocr, ocr_lido = self._ler_ocr(captcha_bytes), True
+                resposta = self._resolver_local(captcha_bytes, leitura_ocr, inicio)
+            elif solver == '2captcha':
+                resposta = self._resolver_2captcha(captcha_bytes)
+                falha_servico = resposta is None
+            else:
+                self.logger.warning(f"Solver de captcha desconhecido: {solver}")
+                continue
+            if resposta and resposta[0]:
+                return resposta
+        
+        if falha_servico:
+            # Fallback para OCR local
+            if self.ui:
+                print(f"{Fore.YELLOW}  ⚠️  Tentando OCR local...")
+            inicio = time.perf_counter()
+            if not ocr_lido:
+                leitura_ocr = self._ler_ocr(captcha_bytes)
+            texto_limpo = leitura_ocr[0] if leitura_ocr else ""
+            if texto_limpo and len(texto_limpo) >= 4:
+                if self.ui:
+                    print(f"{Fore.GREEN}  ✅ Captcha resolvido via OCR: {texto_limpo}")
+                self.logger.info(f"Captcha resolvido via fallback OCR: {texto_limpo}")
+                return self._entregar("ocr_fallback", texto_limpo, captcha_bytes, inicio)
+        return "", None
+
+    def registrar_resultado(self, aceito: bool) -> None:
+        """Registra se o SEI aceitou a última resposta enviada.
+
+        Alimenta as estatísticas por solver e o registro de amostras,
+        informa o 2captcha sobre respostas erradas e, após uma resposta local
+        rejeitada, faz a próxima tentativa pular esse solver.
+        """
+        if not self._ultima_resposta:
+            return
+        estrategia, captcha_id, confianca, amostra_id = self._ultima_resposta
+        self._ultima_resposta = None
+        estatisticas_captcha.registrar(estrategia, aceito, confianca)
+        if self.amostras and amostra_id:
+            self.amostras.marcar(amostra_id, aceito)
+        if estrategia in ("model", "tesseract"):
+            self._pular = None if aceito else estrategia
+        elif estrategia == "2captcha" and not aceito:
+            self.pipeline.reportar(captcha_id, False)
+
     def resolver_captcha(self, max_tentativas: int = None) -> str:
-        """Resolve CAPTCHA usando 2captcha com fallback para OCR local"""
+        """Resolve o CAPTCHA exibido, recarregando-o a cada resposta não obtida.
+
+        Tentativas, tempo total e esperas seguem a política ``captcha`` de
+        :mod:`sei_aneel.retry`: captchas não resolvidos são recarregados sem
+        espera e erros de página usam uma espera curta com jitter.
+        """
         if max_tentativas is None:
             max_tentativas = self.config.get('execution.captcha_max_tries', 5)
+        controle = retry.Retentativa(
+            "captcha", retry.POLITICAS["captcha"].com(tentativas=max_tentativas), self.logger
+        )
             
-        for tentativa in range(1, max_tentativas + 1):
+        for tentativa in controle:
             if self.ui:
                 print(f"\n{Fore.YELLOW}🔍 Resolvendo captcha - Tentativa {tentativa}/{max_tentativas}")
-            self.logger.info(f"Tentativa {tentativa} de {max_tentativas} para resolver captcha via 2captcha")
+            self.logger.info(f"Tentativa {tentativa} de {max_tentativas} para resolver captcha")
             
+            erro = None
             try:
-                img = WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.ID, "imgCaptcha"))
-                )
-                time.sleep(1)
-                captcha_bytes = img.screenshot_as_png
-                img_path = self.temp_dir / f"captcha_{tentativa}.png"
-                
-                with open(img_path, "wb") as f:
-                    f.write(captcha_bytes)
-                
-                # Tenta resolver com 2captcha
-                try:
-                    if self.ui:
-                        print(f"{Fore.CYAN}  🌐 Enviando para 2captcha...")
-                    result = self.solver.normal(str(img_path))
-                    captcha_text = result['code']
-                    if captcha_text and len(captcha_text) >= 4:
-                        if self.ui:
-                            print(f"{Fore.GREEN}  ✅ Captcha resolvido: {captcha_text}")
-                        self.logger.info(f"Captcha resolvido via 2captcha: {captcha_text}")
-                        return captcha_text
-                except Exception as e:
-                    if self.ui:
-                        print(f"{Fore.YELLOW}  ⚠️  2captcha falhou, tentando OCR local...")
-                    self.logger.warning(f"2captcha falhou: {e}. Tentando fallback OCR local.")
-                    
-                    # Fallback para OCR local
-                    texto = self.ocr_captcha_pil(str(img_path))
-                    texto_limpo = ''.join(filter(str.isalnum, texto))
-                    if texto_limpo and len(texto_limpo) >= 4:
-                        if self.ui:
-                            print(f"{Fore.GREEN}  ✅ Captcha resolvido via OCR: {texto_limpo}")
-                        self.logger.info(f"Captcha resolvido via fallback OCR: {texto_limpo}")
-                        return texto_limpo
+                img, captcha_bytes = self.imagem_atual()
+                captcha_text = self.resolver_imagem(captcha_bytes, tentativa)
+                if captcha_text:
+                    return captcha_text
                 
                 # Tenta recarregar o captcha
                 try:
+                    src_anterior = img.get_attribute("src")
                     reload_btn = self.driver.find_element(By.ID, "imgRecaptcha")
                     reload_btn.click()
                     if self.ui:
                         print(f"{Fore.YELLOW}  🔄 Recarregando captcha...")
-                    self.logger.info("Aguardando 3 segundos entre tentativas de captcha...")
-                    time.sleep(3)
-                except:
-                    self.logger.info("Aguardando 3 segundos entre tentativas de captcha...")
-                    time.sleep(3)
+                    self._aguardar_novo_captcha(img, src_anterior)
+                except Exception as e:
+                    self.logger.debug(f"Recarga do captcha não confirmada: {e}")
+                classe = retry.CAPTCHA_REJEITADO
                     
             except Exception as e:
                 self.logger.error(f"Erro na tentativa {tentativa} de captcha: {e}")
-                time.sleep(3)
+                erro = e
+                classe = retry.classificar(e)
+            
+            if not controle.aguardar(classe, erro):
+                if controle.motivo:
+                    self.logger.info(f"Captcha: tentativas encerradas ({controle.motivo})")
+                break
         
         if self.ui:
-            print(f"{Fore.RED}  ❌ Falha ao resolver captcha após {max_tentativas} tentativas")
+            print(f"{Fore.RED}  ❌ Falha ao resolver captcha após {controle.tentativa} tentativas")
         self.logger.warning("Falha ao resolver captcha após múltiplas tentativas")
         return ""
 
-    def limpar_captchas(self):
-        """Remove arquivos temporários de captcha"""
+    def imagem_atual(self):
+        """Elemento e conteúdo PNG do captcha exibido, após carregar"""
+        img = WebDriverWait(self.driver, self.wait_timeout).until(
+            EC.presence_of_element_located((By.ID, "imgCaptcha"))
+        )
+        self._aguardar_imagem_carregada(img)
+        return img, img.screenshot_as_png
+
+    def _aguardar_imagem_carregada(self, img) -> None:
+        """Aguarda o navegador terminar de decodificar a imagem do captcha"""
         try:
-            for arquivo in self.temp_dir.glob('captcha_*.png'):
-                arquivo.unlink()
-        except Exception as e:
-            self.logger.warning(f"Erro ao limpar captchas: {e}")
+            WebDriverWait(self.driver, self.captcha_wait_timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(
+                    "return arguments[0].complete && arguments[0].naturalWidth > 0;", img
+                )
+            )
+        except Exception:
+            self.logger.debug("Imagem do captcha não confirmou carregamento no tempo limite")
+
+    def _aguardar_novo_captcha(self, img, src_anterior: Optional[str]) -> None:
+        """Aguarda a troca do captcha após clicar em recarregar.
+
+        Considera recarregado quando o elemento é substituído ou quando seu
+        ``src`` muda; em seguida espera a nova imagem terminar de carregar.
+        """
+        def _trocou(driver):
+            try:
+                return img.get_attribute("src") != src_anterior
+            except StaleElementReferenceException:
+                return True
+
+        with latencias.etapa("captcha_recarga"):
+            WebDriverWait(self.driver, self.captcha_wait_timeout, poll_frequency=0.1).until(_trocou)
+            try:
+                novo = self.driver.find_element(By.ID, "imgCaptcha")
+                self._aguardar_imagem_carregada(novo)
+            except Exception:
+                pass
 
 class SEIAneel:
     """Classe principal para interação com o PAINEEL"""
     
-    def __init__(self, driver, config: ConfigManager, logger, ui: InteractiveUI = None):
+    def __init__(self, driver, config: ConfigManager, logger, ui: Optional[InteractiveUI],
+                 captcha_pipeline: CaptchaPipeline,
+                 captcha_amostras: Optional[CaptchaSampleStore] = None,
+                 ha_proximo: Optional[Callable[[], bool]] = None):
         self.driver = driver
         self.config = config
         self.logger = logger
         self.ui = ui
-        self.captcha_handler = CaptchaHandler(driver, config, logger, ui)
+        self.captcha_handler = CaptchaHandler(driver, config, logger, ui, captcha_pipeline, captcha_amostras)
+        self.wait_timeout = config.get('execution.wait_timeout', 20)
+        self._aba_pesquisa = None
+        # Captcha do formulário resolvido enquanto o processo anterior é extraído
+        self.prefetch = criar_prefetch_captcha(config, self.captcha_handler, logger, ha_proximo)
 
     def pesquisar_e_entrar_processo(self, numero_processo: str) -> bool:
         """
         Pesquisa e acessa um processo específico no PAINEEL
         
+        Um captcha recusado pelo SEI leva a uma nova pesquisa, conforme a
+        política ``captcha`` de :mod:`sei_aneel.retry`.
+        
         Args:
             numero_processo: Número do processo a ser pesquisado
             
         Returns:
             True se conseguiu acessar o processo, False caso contrário
         """
-        if self.ui:
-            print(f"\n{Fore.CYAN}🔍 Acessando processo: {Fore.YELLOW}{numero_processo}")
-            
-        url = ("https://sei.aneel.gov.br/sei/modulos/pesquisa/"
-               "md_pesq_processo_pesquisar.php?acao_externa=protocolo_pesquisar"
-               "&acao_origem_externa=protocolo_pesquisar&id_orgao_acesso_externo=0")
+        max_tentativas = self.config.get('execution.captcha_max_tries', 5)
+        controle = retry.Retentativa(
+            "captcha", retry.POLITICAS["captcha"].com(tentativas=max_tentativas), self.logger
+        )
+        for tentativa in controle:
+            try:
+                return self._pesquisar_e_entrar(numero_processo)
+            except retry.CaptchaRejeitadoError as e:
+                if self.ui:
+                    print(f"{Fore.YELLOW}  🔄 Captcha recusado pelo SEI; pesquisando novamente...")
+                self.logger.info(f"Captcha recusado pelo SEI na tentativa {tentativa}: {e}")
+                if not controle.aguardar(retry.classificar(e), e):
+                    break
         
-        self.driver.get(url)
-        WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        if self.ui:
+            print(f"{Fore.RED}  ❌ Captcha recusado pelo SEI em todas as tentativas")
+        self.logger.warning(f"Captcha recusado pelo SEI em todas as tentativas para {numero_processo}")
+        return False
 
-        # Localiza o campo de processo
-        campo_proc = None
-        selectors = [
-            (By.ID, "txtProtocoloPesquisa"),
-            (By.XPATH, "//input[@name='txtProtocoloPesquisa']"),
-            (By.XPATH, "//input[contains(@placeholder, 'Processo')]")
-        ]
+    def _pesquisar_e_entrar(self, numero_processo: str) -> bool:
+        """Uma pesquisa do processo, com o captcha exibido no formulário
         
-        for selector in selectors:
-            try:
-                campo_proc = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located(selector)
-                )
-                break
-            except:
-                continue
+        Raises:
+            retry.CaptchaRejeitadoError: Se o SEI recusar o captcha
+        """
+        if self.ui:
+            print(f"\n{Fore.CYAN}🔍 Acessando processo: {Fore.YELLOW}{numero_processo}")
+            
+        with latencias.etapa("carregar_pesquisa"):
+            campo_proc = self._ir_para_formulario()
         
         if not campo_proc:
             if self.ui:
@@ -515,7 +843,6 @@ class SEIAneel:
         numero_processo = str(numero_processo).strip()
         campo_proc.clear()
         campo_proc.send_keys(numero_processo)
-        time.sleep(0.3)
         
         # Verifica se foi preenchido corretamente
         valor_atual = campo_proc.get_attribute('value')
@@ -544,7 +871,8 @@ class SEIAneel:
             self.logger.error("Campo de captcha não encontrado")
             return False
             
-        captcha = self.captcha_handler.resolver_captcha()
+        with latencias.etapa("captcha"):
+            captcha = self._captcha_antecipado() or self.captcha_handler.resolver_captcha()
         if not captcha:
             if self.ui:
                 print(f"{Fore.RED}  ❌ Não foi possível resolver captcha")
@@ -554,50 +882,219 @@ class SEIAneel:
         campo_captcha.clear()
         campo_captcha.send_keys(captcha)
 
-        # Clica no botão pesquisar
+        # Clica no botão pesquisar e aguarda o recarregamento da página
         try:
-            botao = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "sbmPesquisar"))
-            )
-            botao.click()
-            if self.ui:
-                print(f"{Fore.CYAN}  🔍 Pesquisando processo...")
-            self.logger.info("Botão Pesquisar clicado")
-            time.sleep(5)
+            with latencias.etapa("pesquisar"):
+                botao = WebDriverWait(self.driver, 10).until(
+                    EC.element_to_be_clickable((By.ID, "sbmPesquisar"))
+                )
+                botao.click()
+                if self.ui:
+                    print(f"{Fore.CYAN}  🔍 Pesquisando processo...")
+                self.logger.info("Botão Pesquisar clicado")
+                self._aguardar_resultado_pesquisa(botao)
         except Exception as e:
             if self.ui:
                 print(f"{Fore.RED}  ❌ Erro ao pesquisar")
             self.logger.error(f"Erro ao clicar no botão pesquisar: {e}")
             return False
 
+        # Um alerta (captcha recusado) bloqueia os demais comandos ao
+        # navegador, por isso é tratado antes de procurar o link
+        alerta = self._fechar_alerta()
+        if alerta is not None:
+            rejeitado = captcha_rejeitado(alerta)
+            self.captcha_handler.registrar_resultado(not rejeitado)
+            if rejeitado:
+                raise retry.CaptchaRejeitadoError(alerta)
+            if self.ui:
+                print(f"{Fore.RED}  ❌ {alerta}")
+            self.logger.warning(f"Alerta após pesquisar {numero_processo}: {alerta}")
+            return False
+
         # Procura o link do processo nos resultados
-        numero_proc_normalizado = normalizar_numero(numero_processo)
-        links_processo = self.driver.find_elements(By.XPATH, '//a')
-        
-        for link in links_processo:
-            link_texto = link.text.strip()
-            link_texto_normalizado = normalizar_numero(link_texto)
-            if link.is_displayed() and link_texto_normalizado == numero_proc_normalizado:
-                if self.ui:
-                    print(f"{Fore.GREEN}  ✅ Processo encontrado: {link_texto}")
-                self.logger.info(f"Link do processo encontrado: '{link_texto}'")
-                try:
-                    link.click()
-                except Exception:
-                    self.driver.execute_script("arguments[0].click();", link)
-                time.sleep(2)
-                
-                # Muda para nova aba se necessário
-                abas = self.driver.window_handles
-                if len(abas) > 1:
-                    self.driver.switch_to.window(abas[-1])
-                return True
+        encontrado = localizar_link_processo(self.driver, normalizar_numero(numero_processo))
+        if not encontrado and self._captcha_rejeitado():
+            self.captcha_handler.registrar_resultado(False)
+            raise retry.CaptchaRejeitadoError("mensagem de captcha inválido na página de resultados")
+        self.captcha_handler.registrar_resultado(True)
+        if encontrado:
+            link, link_texto = encontrado
+            if self.ui:
+                print(f"{Fore.GREEN}  ✅ Processo encontrado: {link_texto}")
+            self.logger.info(f"Link do processo encontrado: '{link_texto}'")
+            with latencias.etapa("abrir_processo"):
+                self._abrir_link_processo(link)
+            self._antecipar_captcha()
+            return True
         
         if self.ui:
             print(f"{Fore.RED}  ❌ Processo não encontrado nos resultados")
         self.logger.warning(f"Link do processo {numero_processo} não encontrado na lista de links clicáveis.")
         return False
 
+    def _antecipar_captcha(self) -> None:
+        """Começa a resolver o captcha que o formulário já exibe na aba de pesquisa"""
+        if not self.prefetch or not self.prefetch.deve_antecipar():
+            return
+        aba_processo = self.driver.current_window_handle
+        if aba_processo == self._aba_pesquisa:
+            return  # processo aberto na própria aba; o formulário não está mais lá
+        try:
+            self.driver.switch_to.window(self._aba_pesquisa)
+            img, captcha_bytes = self.captcha_handler.imagem_atual()
+            self.prefetch.iniciar(captcha_bytes, img)
+        except Exception as e:
+            self.logger.debug(f"Captcha antecipado indisponível: {e}")
+        finally:
+            self.driver.switch_to.window(aba_processo)
+
+    def _captcha_antecipado(self) -> str:
+        """Resposta antecipada, se o formulário ainda exibe o mesmo captcha"""
+        if not self.prefetch:
+            return ""
+        antecipado = self.prefetch.obter()
+        if not antecipado:
+            return ""
+        texto, img = antecipado
+        try:
+            if self.driver.find_element(By.ID, "imgCaptcha") != img:
+                return ""
+        except Exception:
+            return ""
+        if self.ui:
+            print(f"{Fore.GREEN}  ⚡ Captcha já resolvido: {texto}")
+        self.logger.info("Usando captcha resolvido antecipadamente")
+        return texto
+
+    def fechar(self) -> None:
+        if self.prefetch:
+            self.prefetch.fechar()
+
+    def _fechar_abas_extras(self) -> None:
+        """Fecha abas abertas por processos anteriores e volta à aba de pesquisa"""
+        abas = self.driver.window_handles
+        if self._aba_pesquisa not in abas:
+            self._aba_pesquisa = abas[0]
+        for aba in abas:
+            if aba != self._aba_pesquisa:
+                self.driver.switch_to.window(aba)
+                self.driver.close()
+        self.driver.switch_to.window(self._aba_pesquisa)
+
+    def _ir_para_formulario(self):
+        """Retorna o campo de processo, recarregando a pesquisa só se necessário.
+
+        Após uma pesquisa, a aba principal continua exibindo o formulário (com
+        um captcha novo) e a sessão do SEI é mantida, então basta reutilizá-lo.
+        """
+        try:
+            self._fechar_abas_extras()
+            if "md_pesq_processo_pesquisar.php" in self.driver.current_url:
+                campos = self.driver.find_elements(By.ID, "txtProtocoloPesquisa")
+                if campos:
+                    self.logger.debug("Reutilizando formulário de pesquisa já carregado")
+                    return campos[0]
+        except Exception as e:
+            # Ex.: alerta de captcha inválido pendente; recarrega a pesquisa
+            self.logger.debug(f"Formulário anterior não reutilizável: {e}")
+
+        def _carregar():
+            self.driver.get(URL_PESQUISA)
+            WebDriverWait(self.driver, self.wait_timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+        retry.executar(_carregar, "navegacao", logger=self.logger)
+
+        # Localiza o campo de processo
+        selectors = [
+            (By.ID, "txtProtocoloPesquisa"),
+            (By.XPATH, "//input[@name='txtProtocoloPesquisa']"),
+            (By.XPATH, "//input[contains(@placeholder, 'Processo')]")
+        ]
+        
+        for selector in selectors:
+            try:
+                return WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located(selector)
+                )
+            except:
+                continue
+        return None
+
+    def _fechar_alerta(self) -> Optional[str]:
+        """Texto do alerta exibido, após fechá-lo; ``None`` se não houver"""
+        try:
+            alerta = self.driver.switch_to.alert
+            texto = alerta.text
+            alerta.accept()
+            return texto
+        except Exception:
+            return None
+
+    def _captcha_rejeitado(self) -> bool:
+        """Indica se a página de resultados diz que o SEI recusou o captcha"""
+        try:
+            return captcha_rejeitado(self.driver.page_source)
+        except Exception:
+            return False
+
+    def _aguardar_resultado_pesquisa(self, botao) -> None:
+        """Aguarda a página de resultados após o envio do formulário.
+
+        O envio recarrega a página, tornando o botão obsoleto; um alerta
+        (por exemplo, captcha inválido) também encerra a espera.
+        """
+        def _carregou(driver):
+            try:
+                driver.switch_to.alert
+                return True
+            except Exception:
+                pass
+            try:
+                botao.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                return driver.execute_script("return document.readyState") == "complete"
+
+        try:
+            WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.2).until(_carregou)
+        except TimeoutException:
+            self.logger.warning("Página de resultados não recarregou no tempo limite")
+
+    def _abrir_link_processo(self, link) -> None:
+        """Clica no link do processo e aguarda a página do processo abrir"""
+        abas_antes = set(self.driver.window_handles)
+        try:
+            link.click()
+        except Exception:
+            self.driver.execute_script("arguments[0].click();", link)
+
+        # O SEI costuma abrir o processo em nova aba; se navegar na mesma aba,
+        # o link fica obsoleto
+        def _abriu(driver):
+            if len(driver.window_handles) > len(abas_antes):
+                return True
+            try:
+                link.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                return True
+
+        try:
+            WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.1).until(_abriu)
+        except TimeoutException:
+            self.logger.warning("Nenhuma nova aba ou navegação detectada após abrir o processo")
+
+        novas = [aba for aba in self.driver.window_handles if aba not in abas_antes]
+        if novas:
+            self.driver.switch_to.window(novas[-1])
+        try:
+            WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.ID, "tblCabecalho"))
+            )
+        except TimeoutException:
+            self.logger.warning("Cabeçalho do processo não apareceu no tempo limite")
+
     def extrair_detalhes_processo(self) -> Dict[str, str]:
         """Extrai detalhes básicos do processo"""
         dados = {}
@@ -669,12 +1166,7 @@ class SEIAneel:
     def buscar_interessados_redundante(self) -> str:
         """Busca interessados diretamente no HTML quando a extração padrão falhar."""
         try:
-            source = self.driver.page_source
-            match = re.search(r"Interessad[oa]s?</td>\s*<td[^>]*>(.*?)</td>", source, re.IGNORECASE | re.DOTALL)
-            if match:
-                texto = re.sub(r"<[^>]+>", "", match.group(1))
-                texto = re.sub(r"\s+", " ", texto).strip()
-                return texto
+            return buscar_interessados_html(self.driver.page_source)
         except Exception as e:
             self.logger.error(f"Erro na busca redundante de interessados: {e}")
         return ""
@@ -689,21 +1181,11 @@ class SEIAneel:
         um link absoluto quando necessário.
         """
         try:
-            base_url = self.driver.current_url
-            href = elem.get_attribute("href")
-            if href and not href.lower().startswith("javascript"):
-                return urljoin(base_url, href)
-
-            onclick = elem.get_attribute("onclick") or ""
-            if onclick:
-                candidatos = re.findall(
-                    r"['\"](https?://[^'\"]+|/[^'\"]+|\w+\.php[^'\"]*)['\"]",
-                    onclick,
-                )
-                for url in reversed(candidatos):
-                    if url.lower().startswith("javascript"):
-                        continue
-                    return urljoin(base_url, url)
+            return extrair_link_documento(
+                elem.get_attribute("href") or "",
+                elem.get_attribute("onclick") or "",
+                self.driver.current_url,
+            )
         except Exception as e:
             self.logger.debug(f"Falha ao extrair link de documento: {e}")
         return ""
@@ -762,80 +1244,553 @@ class SEIAneel:
             self.logger.error(f"Erro ao extrair andamentos: {e}")
             return "", "", ""
 
+    def extrair_dados_processo(self, html: Optional[str] = None) -> Tuple[Dict[str, str], Tuple[str, ...], Tuple[str, str, str]]:
+        """Extrai detalhes, documentos e andamentos da página do processo.
+
+        No modo ``fast`` (padrão) o HTML é obtido uma única vez (ou recebido
+        em ``html``) e analisado localmente; se a validação do parser falhar,
+        os extratores Selenium célula a célula são usados como fallback.
+        """
+        if self.config.get('execution.extraction_mode', 'fast') == 'fast':
+            try:
+                dados = parse_pagina_processo(html or self.driver.page_source, self.driver.current_url)
+                self.logger.debug("Página do processo extraída pelo parser rápido")
+                return dados["detalhes"], dados["documentos"], dados["andamentos"]
+            except ParserError as e:
+                self.logger.warning(f"Parser rápido rejeitou a página ({e}), usando extração Selenium")
+            except Exception as e:
+                self.logger.warning(f"Erro no parser rápido: {e}. Usando extração Selenium")
+
+        return (
+            self.extrair_detalhes_processo(),
+            self.extrair_lista_protocolos_concatenado(),
+            self.extrair_andamentos_concatenado(),
+        )
+
 # Continuarei com as outras classes na próxima mensagem devido ao limite de caracteres...
 
+def linha_do_intervalo(intervalo: Optional[str]) -> Optional[int]:
+    """Primeira linha de um intervalo A1 como ``'Processos'!A58:L58``"""
+    encontrado = re.search(r"!?[A-Z]+(\d+)(?::[A-Z]+\d+)?$", intervalo or "")
+    return int(encontrado.group(1)) if encontrado else None
+
+def escrita_confirmada(resposta: Optional[Dict[str, Any]], linhas: List[List[str]],
+                       primeira_linha: Optional[int] = None) -> bool:
+    """Confere a resposta da API de uma escrita (``UpdateValuesResponse``)
+
+    O intervalo gravado deve começar em ``primeira_linha`` (quando conhecida)
+    e ``updatedCells`` deve cobrir ao menos as células não vazias enviadas.
+    """
+    resposta = resposta or {}
+    linha = linha_do_intervalo(resposta.get("updatedRange"))
+    if linha is None or (primeira_linha is not None and linha != primeira_linha):
+        return False
+    esperadas = sum(1 for valores in linhas for valor in valores if str(valor).strip())
+    return int(resposta.get("updatedCells") or 0) >= esperadas
+
 class PlanilhaHandler:
-    """Gerenciador de interação com Google Sheets"""
+    """Gerenciador de interação com Google Sheets
+    
+    Mantém um índice em memória (número normalizado → linha) da coluna A,
+    carregado uma vez e atualizado a cada inserção. O índice é recarregado
+    após ``google_drive.row_index_ttl`` segundos, após erro de escrita e
+    antes de uma escrita se a revisão do arquivo no Drive não for a última
+    conhecida (outra ferramenta removeu ou moveu linhas).
+    
+    Com ``google_drive.write_behind`` as escritas vão para um buffer,
+    descarregado em um ``batch_update`` (atualizações) e um ``append_rows``
+    (inserções) a cada ``write_batch_size`` linhas ou ``write_flush_seconds``
+    segundos, antes de leituras da planilha inteira e em :meth:`descarregar`.
+    
+    Com ``google_drive.mirror`` as escritas também vão para um espelho local
+    (:mod:`sei_aneel.sheet_mirror`), que responde :meth:`get_all_values`
+    enquanto a revisão do arquivo no Drive não mudar por outra fonte.
+    """
     
     def __init__(self, config: ConfigManager, logger):
         self.config = config
         self.logger = logger
+        # Serializa o acesso à planilha quando há workers paralelos
+        self._lock = threading.RLock()
+        self._indice: Optional[Dict[str, int]] = None
+        self._indice_carregado = 0.0
+        self._indice_ttl = config.get('google_drive.row_index_ttl', 300)
+        # Revisão do Drive após a última leitura do índice ou escrita nossa
+        self._revisao_conhecida: Optional[str] = None
+        self.write_behind = config.get('google_drive.write_behind', True)
+        self._lote_maximo = max(1, config.get('google_drive.write_batch_size', 20))
+        self._lote_segundos = config.get('google_drive.write_flush_seconds', 30)
+        # Buffer de escrita: número normalizado → (linha da planilha, callback)
+        self._buffer: Dict[str, Tuple[List[str], Optional[Callable[[], None]]]] = {}
+        # Inserções descartadas sem confirmação desde o último descarregamento
+        self._descartados: Set[str] = set()
+        self._pendente_desde = 0.0
         self.sheet = self._iniciar_sheet()
+        self.espelho = self._abrir_espelho()
     
     def _iniciar_sheet(self):
         """Inicializa conexão com Google Sheets"""
-        def _init():
-            scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-            creds_file = self.config.get('google_drive.credentials_file')
-            creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, scope)
-            client = gspread.authorize(creds)
-            sheet_name = self.config.get('google_drive.sheet_name')
-            worksheet_name = self.config.get('google_drive.worksheet_name')
-            return client.open(sheet_name).worksheet(worksheet_name)
+        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+        creds_file = self.config.get('google_drive.credentials_file')
+        creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, scope)
+        client = gspread.authorize(creds)
+        sheet_name = self.config.get('google_drive.sheet_name')
+        worksheet_name = self.config.get('google_drive.worksheet_name')
+        # Abrir a planilha e depois a aba são duas requisições de leitura
+        planilha = self._chamar(lambda: client.open(sheet_name), LEITURA)
+        return self._chamar(lambda: planilha.worksheet(worksheet_name), LEITURA)
+    
+    def _abrir_espelho(self) -> Optional[EspelhoPlanilha]:
+        if not self.config.get('google_drive.mirror', True):
+            return None
+        try:
+            return EspelhoPlanilha(
+                self.config.get('google_drive.mirror_path'),
+                origem=f"{self.sheet.spreadsheet.id}/{self.sheet.id}",
+                idade_maxima=self.config.get('google_drive.mirror_max_age', 21600),
+                logger=self.logger,
+            )
+        except Exception as e:
+            self.logger.warning(f"Espelho local da planilha indisponível: {e}")
+            return None
+    
+    def _revisao_remota(self) -> Optional[str]:
+        """``modifiedTime`` do arquivo no Drive (API do Drive, fora da cota do Sheets)"""
+        try:
+            return operacao_com_retry(self.sheet.spreadsheet.get_lastUpdateTime, logger=self.logger)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível consultar a revisão da planilha: {e}")
+            return None
+    
+    def _revisao_antes_de_escrever(self) -> Optional[str]:
+        """Revisão remota logo antes de uma escrita
         
-        return operacao_com_retry(_init, logger=self.logger)
+        Se não for a última conhecida, outra fonte alterou a planilha: o
+        índice é descartado e as linhas de destino devem ser localizadas de
+        novo, depois desta chamada.
+        """
+        revisao = self._revisao_remota()
+        if revisao is None or revisao != self._revisao_conhecida:
+            if self._indice is not None:
+                self.logger.info("Planilha alterada por outra fonte; relendo o índice de linhas")
+            self._indice = None
+        return revisao
+    
+    def _espelhar(self, respostas: List[Dict[str, Any]], revisao_antes: Optional[str]) -> None:
+        """Registra uma escrita confirmada e aplica ao espelho os valores exibidos
+        
+        ``revisao_antes`` vem de :meth:`_revisao_antes_de_escrever`; a revisão
+        de depois é lida agora e passa a ser a última conhecida.
+        """
+        revisao_depois = self._revisao_remota()
+        self._revisao_conhecida = revisao_depois
+        if not self.espelho:
+            return
+        linhas: Dict[int, List[str]] = {}
+        for resposta in respostas:
+            inicio = linha_do_intervalo(resposta.get("updatedRange"))
+            dados = resposta.get("updatedData")
+            if inicio is None or dados is None or revisao_antes is None:
+                self.espelho.invalidar()
+                return
+            for deslocamento, valores in enumerate(dados.get("values", [])):
+                linhas[inicio + deslocamento] = valores
+        if not self.espelho.gravar_linhas(linhas, revisao_antes, revisao_depois):
+            self._indice = None
+    
+    def _falha_de_escrita(self) -> None:
+        """Após erro de escrita nem o índice nem o espelho são confiáveis"""
+        self._indice = None
+        if self.espelho:
+            self.espelho.invalidar()
+    
+    def _chamar(self, func, tipo: str) -> Any:
+        """Chamada à API dentro da cota de leitura/escrita e com retry"""
+        return operacao_com_retry(lambda: cota_planilha.chamar(func, tipo), logger=self.logger)
+    
+    def _chamar_insercao(self, func) -> Any:
+        """Inserção dentro da cota de escrita, repetida só após erro de cota
+        
+        Num erro de rede a API pode ter aplicado a inserção; repeti-la às
+        cegas duplicaria as linhas.
+        """
+        controle = retry.Retentativa("planilha", logger=self.logger)
+        for tentativa in controle:
+            try:
+                return cota_planilha.chamar(func, ESCRITA)
+            except Exception as e:
+                classe = retry.classificar(e)
+                if classe != retry.COTA_EXCEDIDA or not controle.aguardar(classe, e):
+                    raise
+                self.logger.warning(f"Cota excedida ao inserir na planilha (tentativa {tentativa}): {e}")
     
     def normalizar_numero(self, numero: str) -> str:
         """Remove caracteres não numéricos"""
         return re.sub(r"\D", "", numero)
     
+    def _ler_coluna_processos(self) -> List[str]:
+        """Lê a coluna A e reconstrói o índice de linhas"""
+        # A revisão é lida antes da coluna: uma edição entre as duas leituras
+        # só faz a próxima escrita reler o índice
+        revisao = self._revisao_remota()
+        coluna = self._chamar(lambda: self.sheet.col_values(1), LEITURA)
+        indice: Dict[str, int] = {}
+        for idx, val in enumerate(coluna[1:], start=2):
+            # Em números repetidos vale a primeira linha, como na busca sequencial
+            indice.setdefault(self.normalizar_numero(val), idx)
+        indice.pop("", None)
+        self._indice = indice
+        self._indice_carregado = time.monotonic()
+        self._revisao_conhecida = revisao
+        return coluna
+    
+    def invalidar_indice(self) -> None:
+        """Descarta o índice de linhas; a próxima busca relê a coluna A"""
+        with self._lock:
+            self._indice = None
+    
     def find_row_by_proc_number(self, proc_number: str) -> Optional[int]:
-        """Encontra linha do processo na planilha"""
-        def _find_row():
-            proc_col = self.sheet.col_values(1)
-            proc_number_norm = self.normalizar_numero(proc_number)
-            for idx, val in enumerate(proc_col[1:], start=2):
-                if self.normalizar_numero(val) == proc_number_norm:
-                    return idx
-            return None
+        """Encontra linha do processo na planilha (inserções ainda no buffer não têm linha)"""
+        with self._lock:
+            if self._indice is None or time.monotonic() - self._indice_carregado > self._indice_ttl:
+                self._ler_coluna_processos()
+            return self._indice.get(self.normalizar_numero(proc_number))
+    
+    def atualizar_ou_inserir_processo(self, linha: List[str], proc_number: str,
+                                      ao_gravar: Optional[Callable[[], None]] = None) -> str:
+        """Atualiza processo existente ou insere novo
         
-        return operacao_com_retry(_find_row, logger=self.logger)
+        ``ao_gravar`` é chamado quando a linha estiver de fato na planilha:
+        na hora ou, com ``write_behind``, quando o lote for descarregado.
+        """
+        # A busca e a escrita ocorrem sob o mesmo lock para evitar inserções
+        # duplicadas quando dois workers tratam o mesmo processo
+        with self._lock:
+            if self.write_behind:
+                # A linha só é resolvida ao descarregar; aqui define apenas o status
+                row_idx = self.find_row_by_proc_number(proc_number)
+                if not self._buffer:
+                    self._pendente_desde = time.monotonic()
+                self._buffer[self.normalizar_numero(proc_number)] = (linha, ao_gravar)
+                if (len(self._buffer) >= self._lote_maximo
+                        or time.monotonic() - self._pendente_desde >= self._lote_segundos):
+                    self.descarregar()
+                return "atualizado" if row_idx else "inserido"
+
+            revisao = self._revisao_antes_de_escrever()
+            row_idx = self.find_row_by_proc_number(proc_number)
+            # A resposta de cada escrita é conferida no lugar de reler a planilha
+            try:
+                if row_idx:
+                    self.logger.info(f"Atualizando linha {row_idx} para processo {proc_number}")
+                    resposta = self._chamar(
+                        lambda: self.sheet.update(
+                            values=[linha], range_name=f"A{row_idx}:L{row_idx}", value_input_option="USER_ENTERED",
+                            include_values_in_response=bool(self.espelho),
+                        ),
+                        ESCRITA
+                    )
+                    if not escrita_confirmada(resposta, [linha], row_idx):
+                        raise RuntimeError(f"atualização da linha {row_idx} não confirmada pela API: {resposta}")
+                    self._espelhar([resposta], revisao)
+                    if ao_gravar:
+                        ao_gravar()
+                    return "atualizado"
+                else:
+                    self.logger.info(f"Inserindo novo processo {proc_number}")
+                    resposta = self._chamar_insercao(
+                        lambda: self.sheet.append_row(
+                            linha, value_input_option="USER_ENTERED", include_values_in_response=bool(self.espelho)
+                        )
+                    )
+                    atualizacao = (resposta or {}).get("updates") or {}
+                    if not escrita_confirmada(atualizacao, [linha]):
+                        raise RuntimeError(f"inserção de {proc_number} não confirmada pela API: {resposta}")
+                    self._espelhar([atualizacao], revisao)
+                    if self._indice is not None:
+                        self._indice[self.normalizar_numero(proc_number)] = linha_do_intervalo(atualizacao["updatedRange"])
+                    if ao_gravar:
+                        ao_gravar()
+                    return "inserido"
+            except Exception:
+                self._falha_de_escrita()
+                raise
     
-    def atualizar_ou_inserir_processo(self, linha: List[str], proc_number: str) -> str:
-        """Atualiza processo existente ou insere novo"""
-        row_idx = self.find_row_by_proc_number(proc_number)
-
-        if row_idx:
-            self.logger.info(f"Atualizando linha {row_idx} para processo {proc_number}")
-            operacao_com_retry(
-                lambda: self.sheet.update(values=[linha], range_name=f"A{row_idx}:L{row_idx}", value_input_option="USER_ENTERED"),
-                logger=self.logger
+    @property
+    def pendentes(self) -> int:
+        """Linhas aguardando no buffer de escrita"""
+        with self._lock:
+            return len(self._buffer)
+    
+    def descarregar(self) -> List[str]:
+        """Grava o buffer de escrita na planilha.
+        
+        A linha de cada processo é resolvida agora, e não ao enfileirar,
+        pelo índice relido se a planilha foi alterada por outra fonte (linhas
+        removidas ou movidas): os dados não caem sobre outro processo.
+        Atualizações e inserções vão em uma chamada cada. Linhas não
+        confirmadas pela API continuam no buffer para o próximo descarregamento.
+        
+        Returns:
+            Números normalizados dos processos que não chegaram à planilha:
+            os que continuam no buffer e as inserções descartadas sem
+            confirmação desde o descarregamento anterior
+        """
+        with self._lock:
+            if self._buffer:
+                revisao = self._revisao_antes_de_escrever()
+                atualizacoes: Dict[int, str] = {}
+                insercoes: List[str] = []
+                for numero in self._buffer:
+                    row = self.find_row_by_proc_number(numero)
+                    if row:
+                        atualizacoes[row] = numero
+                    else:
+                        insercoes.append(numero)
+                if atualizacoes:
+                    self._descarregar_atualizacoes(atualizacoes, revisao)
+                if insercoes:
+                    self._descarregar_insercoes(insercoes)
+            if self._buffer:
+                self._pendente_desde = time.monotonic()
+            nao_gravados = list(self._buffer) + sorted(self._descartados - set(self._buffer))
+            self._descartados.clear()
+            return nao_gravados
+    
+    def _descarregar_atualizacoes(self, lote: Dict[int, str], revisao: Optional[str]) -> None:
+        """Grava as linhas ``lote`` (linha da planilha → número) em um ``batch_update``
+        
+        ``revisao`` é a revisão lida antes de localizar as linhas.
+        """
+        dados = [{"range": f"A{row}:L{row}", "values": [self._buffer[numero][0]]} for row, numero in lote.items()]
+        try:
+            resposta = self._chamar(
+                lambda: self.sheet.batch_update(
+                    dados, value_input_option="USER_ENTERED", include_values_in_response=bool(self.espelho)
+                ),
+                ESCRITA,
             )
-            return "atualizado"
-        else:
-            self.logger.info(f"Inserindo novo processo {proc_number}")
-            operacao_com_retry(lambda: self.sheet.append_row(linha, value_input_option="USER_ENTERED"), logger=self.logger)
-            return "inserido"
+        except Exception as e:
+            self._falha_de_escrita()
+            self.logger.error(f"Falha ao gravar {len(lote)} atualização(ões) na planilha: {e}")
+            return
+        respostas = {
+            linha_do_intervalo(r.get("updatedRange")): r for r in (resposta or {}).get("responses", [])
+        }
+        confirmadas = {
+            row for row, numero in lote.items()
+            if escrita_confirmada(respostas.get(row), [self._buffer[numero][0]], row)
+        }
+        if len(confirmadas) == len(lote):
+            self._espelhar([respostas[row] for row in confirmadas], revisao)
+        elif self.espelho:
+            self.espelho.invalidar()
+        for row, numero in lote.items():
+            if row not in confirmadas:
+                self.logger.warning(f"Atualização da linha {row} ({numero}) não confirmada; mantida no buffer")
+                continue
+            _, ao_gravar = self._buffer.pop(numero)
+            if ao_gravar:
+                ao_gravar()
+        self.logger.info(f"Planilha: {len(confirmadas)} linha(s) atualizada(s) em lote")
     
-    def get_all_processos(self) -> List[str]:
-        """Obtém todos os números de processo da planilha"""
-        def _get_processos():
-            return self.sheet.col_values(1)[1:]  # Pula cabeçalho
+    def _descarregar_insercoes(self, numeros: List[str]) -> None:
+        """Insere as linhas dos processos ``numeros`` em um ``append_rows``"""
+        revisao = self._revisao_antes_de_escrever()
+        # Se o índice foi relido, processos incluídos por outra fonte
+        # continuam no buffer e serão gravados como atualização
+        numeros = [numero for numero in numeros if not self.find_row_by_proc_number(numero)]
+        if not numeros:
+            return
+        linhas = [self._buffer[numero][0] for numero in numeros]
+        try:
+            resposta = self._chamar_insercao(
+                lambda: self.sheet.append_rows(
+                    linhas, value_input_option="USER_ENTERED", include_values_in_response=bool(self.espelho),
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Falha ao inserir {len(numeros)} processo(s) na planilha: {e}")
+            resposta = None
+        # append_rows é atômico: a resposta indica a primeira linha inserida
+        atualizacao = (resposta or {}).get("updates") or {}
+        if escrita_confirmada(atualizacao, linhas):
+            primeira = linha_do_intervalo(atualizacao["updatedRange"])
+            self._espelhar([atualizacao], revisao)
+            for deslocamento, numero in enumerate(numeros):
+                _, ao_gravar = self._buffer.pop(numero)
+                if self._indice is not None:
+                    self._indice[numero] = primeira + deslocamento
+                if ao_gravar:
+                    ao_gravar()
+            self.logger.info(f"Planilha: {len(numeros)} processo(s) inserido(s) em lote")
+            return
         
-        return operacao_com_retry(_get_processos, logger=self.logger)
+        # Sem confirmação a inserção pode ter sido aplicada: a coluna A é
+        # relida e só os processos ausentes continuam no buffer
+        if resposta is not None:
+            self.logger.warning(f"Inserção de {len(numeros)} processo(s) não confirmada pela API: {resposta}")
+        self._falha_de_escrita()
+        try:
+            self._ler_coluna_processos()
+        except Exception as e:
+            # Sem conferir, as linhas saem do buffer para não duplicá-las, e
+            # descarregar() devolve os processos como não gravados
+            self.logger.error(f"Não foi possível conferir a inserção de {len(numeros)} processo(s): {e}")
+            for numero in numeros:
+                self._buffer.pop(numero)
+                self._descartados.add(numero)
+            return
+        inseridos = [numero for numero in numeros if numero in self._indice]
+        for numero in inseridos:
+            _, ao_gravar = self._buffer.pop(numero)
+            if ao_gravar:
+                ao_gravar()
+        self.logger.info(
+            f"Planilha: {len(inseridos)} de {len(numeros)} processo(s) encontrados na coluna A após a inserção"
+        )
+    
+    def get_all_processos(self) -> List[str]:
+        """Obtém todos os números de processo da planilha (e carrega o índice)"""
+        with self._lock:
+            return self._ler_coluna_processos()[1:]  # Pula cabeçalho
     
     def get_all_values(self) -> List[List[str]]:
-        """Obtém todos os valores da planilha"""
+        """Obtém todos os valores da planilha, após descarregar o buffer de escrita
+        
+        Com o espelho local em dia, a planilha não é baixada: basta consultar
+        a revisão do arquivo no Drive.
+        """
         def _get_values():
             return self.sheet.get_all_values()
 
-        return operacao_com_retry(_get_values, logger=self.logger)
+        with self._lock:
+            self.descarregar()
+            if not self.espelho:
+                return self._chamar(_get_values, LEITURA)
+            # A revisão é lida antes dos valores: uma edição entre as duas
+            # leituras só faz a próxima verificação baixar a planilha de novo
+            revisao = self._revisao_remota()
+            valores = self.espelho.valores(revisao)
+            if valores is not None:
+                self.logger.info("Planilha lida do espelho local (sem alterações externas)")
+                return valores
+            valores = self._chamar(_get_values, LEITURA)
+            self.espelho.substituir(valores, revisao)
+            return valores
+    
+    def fechar(self) -> None:
+        """Fecha o espelho local"""
+        with self._lock:
+            if self.espelho:
+                self.espelho.fechar()
+                self.espelho = None
+
+def criar_opcoes_chrome(paths: Dict[str, Optional[str]], perfil: str = "default") -> Options:
+    """Monta as opções do Chrome usadas por todos os workers"""
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    if platform.system() != "Windows":
+        chrome_options.binary_location = paths["chrome_binary"]
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-gpu")
+
+    if perfil == "lean":
+        configurar_opcoes_enxutas(chrome_options)
+    return chrome_options
+
+def criar_driver(paths: Dict[str, Optional[str]], config: ConfigManager):
+    """Inicializa uma nova instância do Chrome controlada pelo Selenium"""
+    perfil = config.get('execution.browser_profile', 'lean')
+    service = Service(executable_path=paths["chromedriver"])
+    driver = webdriver.Chrome(service=service, options=criar_opcoes_chrome(paths, perfil))
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    if perfil == "lean":
+        try:
+            bloquear_recursos(driver, config.get('execution.blocked_url_patterns'))
+        except Exception as e:
+            logging.getLogger("sei_aneel").warning(f"Não foi possível bloquear recursos via CDP: {e}")
+    return driver
 
-    def get_cell_value(self, row: int, col: int) -> str:
-        """Obtém valor de uma célula específica"""
-        def _get_cell():
-            return self.sheet.cell(row, col).value
-        return operacao_com_retry(_get_cell, logger=self.logger)
+class ContextoWorker:
+    """Recursos de um worker: navegador e, opcionalmente, cliente HTTP.
+
+    Com ``execution.engine = "http"`` o navegador só é iniciado se algum
+    processo precisar do fallback Selenium.
+    """
+
+    def __init__(self, paths: Dict[str, Optional[str]], config: ConfigManager, logger,
+                 ui: InteractiveUI = None, adaptador_http=None,
+                 captcha_pipeline: Optional[CaptchaPipeline] = None,
+                 captcha_amostras: Optional[CaptchaSampleStore] = None,
+                 ha_proximo: Optional[Callable[[], bool]] = None):
+        self.paths = paths
+        self.config = config
+        self.logger = logger
+        self.ui = ui
+        self.captcha_pipeline = captcha_pipeline
+        self.captcha_amostras = captcha_amostras
+        self.ha_proximo = ha_proximo
+        self._driver = None
+        self._sei = None
+        self.http = None
+        if config.get('execution.engine', 'selenium') == 'http':
+            captcha_handler = CaptchaHandler(None, config, logger, ui, captcha_pipeline, captcha_amostras)
+            self.http = SEIHttpClient(
+                captcha_handler.resolver_imagem,
+                registrar_captcha=captcha_handler.registrar_resultado,
+                logger=logger,
+                adaptador=adaptador_http,
+                timeout=config.get('execution.wait_timeout', 20),
+                max_tentativas_captcha=config.get('execution.captcha_max_tries', 5),
+                prefetch=criar_prefetch_captcha(config, captcha_handler, logger, ha_proximo),
+            )
+        else:
+            self._driver = criar_driver(paths, config)
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = criar_driver(self.paths, self.config)
+        return self._driver
+
+    @property
+    def sei(self) -> "SEIAneel":
+        """Instância de ``SEIAneel`` reutilizada por todos os processos do worker"""
+        if self._sei is None:
+            self._sei = SEIAneel(
+                self.driver, self.config, self.logger, self.ui, self.captcha_pipeline, self.captcha_amostras,
+                self.ha_proximo,
+            )
+        return self._sei
+
+    def fechar(self) -> None:
+        if self.http:
+            self.http.fechar()
+        if self._sei is not None:
+            self._sei.fechar()
+        if self._driver is not None:
+            rss = medir_rss_navegador(self._driver)
+            if rss:
+                self.logger.info(f"RSS do navegador ao encerrar worker: {rss / 1024 ** 2:.0f} MB")
+            self._driver.quit()
+            self._driver = None
+            self._sei = None
+
+def obter_num_workers(config: ConfigManager) -> int:
+    """Retorna o número de navegadores paralelos respeitando o limite de cortesia"""
+    try:
+        workers = int(config.get('execution.workers', 1))
+        limite = int(config.get('execution.max_workers', 4))
+    except (TypeError, ValueError):
+        return 1
+    return max(1, min(workers, max(1, limite)))
 
 def main() -> List[Dict[str, str]]:
     """
@@ -866,6 +1821,10 @@ def main() -> List[Dict[str, str]]:
                        help='Números de processo específicos para consulta')
     parser.add_argument('--email-tabela', action='store_true',
                        help='Envia tabela completa por email sem atualizar')
+    parser.add_argument('--resume', action='store_true',
+                       help='Retoma a execução anterior a partir do checkpoint, mesmo se antigo')
+    parser.add_argument('--no-resume', action='store_true',
+                       help='Ignora o checkpoint e processa todos os processos')
     args = parser.parse_args()
     
     # Inicializa interface interativa
@@ -935,35 +1894,55 @@ def main() -> List[Dict[str, str]]:
         ui.print_menu()
     
     # Configura Tesseract
-    pytesseract.pytesseract.tesseract_cmd = paths["tesseract"]
+    ocr.tesseract_cmd = paths["tesseract"]
+    ocr.backend = config.get('captcha.ocr_backend', 'auto')
+    ocr.preprocessamento = config.get('captcha.preprocess', 'multi')
+    retry.configurar(config.get('execution.retry'))
+    cota_planilha.configurar(
+        config.get('google_drive.read_quota_per_minute', 60),
+        config.get('google_drive.write_quota_per_minute', 60),
+    )
     
-    # Configura Chrome
-    chrome_options = Options()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    if platform.system() != "Windows":
-        chrome_options.binary_location = paths["chrome_binary"]
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
+    # Configura pool de workers (um Chrome e/ou sessão HTTP por worker)
+    num_workers = obter_num_workers(config)
+    adaptador_http = criar_adaptador(num_workers)
+    captcha_pipeline = None
+    captcha_amostras = None
+    pool = WorkerPool(
+        num_workers,
+        # Sem processo na fila, o próximo captcha não é antecipado (e pago)
+        criar_contexto=lambda: ContextoWorker(
+            paths, config, logger, ui, adaptador_http, captcha_pipeline, captcha_amostras, pool.ha_pendentes
+        ),
+        fechar_contexto=lambda contexto: contexto.fechar(),
+        logger=logger,
+    )
+    if ui and pool.paralelo and ui.step_mode:
+        print(f"{Fore.YELLOW}⚠️  Modo passo-a-passo indisponível com workers paralelos")
+        ui.step_mode = False
     
     keyboard_handler = None
+    planilha_handler = None
+    estado_processos = None
     try:
         # Inicializa componentes
         if ui:
             print(f"\n{Fore.CYAN}🚀 Inicializando navegador...")
-        service = Service(executable_path=paths["chromedriver"])
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        captcha_pipeline = criar_pipeline_captcha(config, logger)
+        verificar_saldo_captcha(config, captcha_pipeline, logger)
+        carregar_modelo_captcha(config, logger)
+        if config.get('captcha.collect_samples', True):
+            captcha_amostras = abrir_amostras_captcha(config, data_dir, logger)
+        pool.iniciar()
 
         if ui:
             print(f"{Fore.GREEN}✅ Navegador inicializado")
+            if pool.paralelo:
+                print(f"{Fore.GREEN}✅ {num_workers} workers paralelos configurados")
+        logger.info(
+            f"Processamento com {num_workers} worker(s), motor {config.get('execution.engine', 'selenium')}"
+        )
 
-        planilha_handler = None
         if not args.processo:
             if ui:
                 print(f"{Fore.CYAN}📊 Conectando à planilha Google...")
@@ -971,6 +1950,11 @@ def main() -> List[Dict[str, str]]:
             if ui:
                 print(f"{Fore.GREEN}✅ Planilha conectada")
 
+        # Estado por processo (modo incremental e prioridade de execução):
+        # só faz sentido quando os dados vão para a planilha
+        if planilha_handler:
+            estado_processos = ProcessStateStore(data_dir / "process_state.json", logger)
+
         if ui:
             keyboard_handler = KeyboardHandler(ui, tracker)
             keyboard_handler.setup_signal_handler()
@@ -980,6 +1964,11 @@ def main() -> List[Dict[str, str]]:
         if ui:
             print(f"\n{Fore.RED}❌ {error_msg}")
         logger.error(error_msg)
+        pool.fechar()
+        if captcha_pipeline:
+            captcha_pipeline.fechar()
+        if captcha_amostras:
+            captcha_amostras.fechar()
         return []
     
     resultados = []
@@ -997,14 +1986,52 @@ def main() -> List[Dict[str, str]]:
             if validar_numero_processo(proc):
                 processos_validos.append(re.sub(r'\D', '', proc.strip()))
         
-        processos_unicos = list(set(processos_validos))
+        # Remove duplicados preservando a ordem da planilha
+        processos_unicos = list(dict.fromkeys(processos_validos))
+        if estado_processos:
+            processos_unicos = estado_processos.ordenar_por_prioridade(
+                processos_unicos,
+                dias_atividade=config.get('execution.recent_activity_days', 7),
+                horas_defasagem=config.get('execution.stale_after_hours', 24),
+            )
         
+        # Retoma execução interrompida a partir do checkpoint
+        checkpoint = None
+        tentativa_inicial = 2
+        if not args.processo:
+            checkpoint_path = data_dir / "checkpoint.json"
+            anterior = None if args.no_resume else RunCheckpoint.carregar(checkpoint_path, logger)
+            idade_maxima = config.get('execution.checkpoint_max_age_hours', 8)
+            if anterior and (args.resume or anterior.idade_horas() <= idade_maxima):
+                checkpoint = anterior
+                processos_unicos = [p for p in processos_unicos if p not in checkpoint.concluidos]
+                # A rodada interrompida é refeita: se já era a última, as
+                # falhas pendentes ainda têm uma tentativa nesta execução
+                tentativa_inicial = max(2, checkpoint.tentativa)
+                msg = (
+                    f"Retomando execução {checkpoint.run_id}: {len(checkpoint.concluidos)} processos já "
+                    f"concluídos, {len(checkpoint.falhas)} com falha (tentativa {checkpoint.tentativa})"
+                )
+                if ui:
+                    print(f"{Fore.YELLOW}♻️  {msg}")
+                logger.info(msg)
+            else:
+                if anterior:
+                    logger.info(f"Checkpoint {anterior.run_id} ignorado ({anterior.idade_horas():.1f}h)")
+                checkpoint = RunCheckpoint(checkpoint_path, logger)
+                logger.info(f"Execução {checkpoint.run_id} iniciada")
+
         # Aplica limite se especificado
         if args.max_processes and args.max_processes > 0:
             processos_unicos = processos_unicos[:args.max_processes]
             if ui:
                 print(f"{Fore.YELLOW}⚠️  Limitado a {args.max_processes} processos")
         
+        if not processos_unicos and checkpoint and checkpoint.concluidos:
+            logger.info("Todos os processos já foram concluídos na execução retomada")
+            checkpoint.remover()
+            return []
+
         if not processos_unicos:
             error_msg = (
                 "Nenhum número de processo válido fornecido!"
@@ -1031,8 +2058,8 @@ def main() -> List[Dict[str, str]]:
         
         tempo_inicio = datetime.now()
         tempo_limite = tempo_inicio + timedelta(seconds=max_execution_time)
-        
-        processos_falha = set()
+        # Nenhuma espera de retry ultrapassa o tempo limite
+        retry.definir_prazo(tempo_limite)
         
         # Inicia rastreamento
         tracker.start(len(processos_unicos))
@@ -1042,67 +2069,120 @@ def main() -> List[Dict[str, str]]:
             print(f"{Fore.WHITE}Tempo limite: {tempo_limite.strftime('%H:%M:%S')}")
             print(f"{Fore.WHITE}ETA inicial: {tracker.get_eta()}")
         
-        # Processa cada processo
-        for i, proc in enumerate(processos_unicos):
-            if ui:
-                ui.handle_pause()
-                
-            if datetime.now() >= tempo_limite:
+        def linha_gravada(proc: str) -> None:
+            if checkpoint:
+                checkpoint.registrar(proc, True)
+
+        def confirmar_gravacao() -> set:
+            """Descarrega o buffer da planilha; processos não gravados contam como falha"""
+            if not planilha_handler:
+                return set()
+            try:
+                nao_gravados = set(planilha_handler.descarregar())
+            except Exception as e:
+                logger.error(f"Erro ao descarregar o buffer da planilha: {e}")
+                return set()
+            nao_gravados &= set(processos_unicos)
+            if nao_gravados:
+                logger.warning(
+                    f"{len(nao_gravados)} processo(s) não gravados na planilha voltam para o retry: "
+                    f"{', '.join(sorted(nao_gravados))}"
+                )
+            for proc in nao_gravados:
+                if checkpoint:
+                    checkpoint.registrar(proc, False)
+            return nao_gravados
+
+        def processar_lote(lote: List[str], status_em_andamento: str) -> Tuple[set, List[str]]:
+            """Processa um lote no pool de workers.
+
+            Retorna os processos com falha e os que não foram iniciados por
+            falta de tempo.
+            """
+            falhas = set()
+            concluidos = [0]
+
+            def tarefa(contexto, proc):
                 if ui:
-                    print(f"\n\n{Fore.YELLOW}⏰ Tempo máximo de execução atingido.")
-                logger.warning("Tempo máximo de execução atingido.")
-                break
-            
-            if ui:
-                ui.print_status(i+1, len(processos_unicos), proc, "processando")
-                ui.wait_for_input()
-            
-            logger.info(f"Processando {i+1}/{len(processos_unicos)}: {proc}")
-            resultado = processar_processo(proc, driver, planilha_handler, config, logger, ui)
-            resultados.append(resultado)
-            tracker.update_stats(resultado["status"])
-            
-            if ui:
-                status_color = "sucesso" if resultado["status"] in ["atualizado", "inserido", "processado"] else "falha"
-                ui.print_status(i+1, len(processos_unicos), proc, status_color)
-                print(f"\n{Fore.WHITE}ETA: {tracker.get_eta()}")
-            
-            if resultado["status"] == "falha":
-                processos_falha.add(proc)
+                    if pool.paralelo:
+                        while ui.paused:
+                            time.sleep(0.5)
+                    else:
+                        ui.handle_pause()
+                        ui.print_status(concluidos[0] + 1, len(lote), proc, status_em_andamento)
+                        ui.wait_for_input()
+                logger.info(f"Processando {concluidos[0] + 1}/{len(lote)}: {proc}")
+                return processar_processo(
+                    proc, contexto, planilha_handler, config, logger, ui, estado_processos, linha_gravada
+                )
+
+            def ao_concluir(proc, resultado):
+                concluidos[0] += 1
+                resultados.append(resultado)
+                tracker.update_stats(resultado["status"])
+                if ui:
+                    status_color = "sucesso" if resultado["status"] in STATUS_SUCESSO else "falha"
+                    ui.print_status(concluidos[0], len(lote), proc, status_color)
+                    print(f"\n{Fore.WHITE}ETA: {tracker.get_eta()}")
+                if resultado["status"] == "falha":
+                    falhas.add(proc)
+                if estado_processos:
+                    estado_processos.salvar()
+                # Linhas gravadas na planilha só contam no checkpoint quando
+                # confirmadas (linha_gravada); com write_behind isso ocorre
+                # no descarregamento do buffer
+                if checkpoint and resultado["status"] not in ("atualizado", "inserido"):
+                    checkpoint.registrar(proc, resultado["status"] != "falha")
+
+            pendentes = pool.executar(
+                lote,
+                tarefa,
+                deve_parar=lambda: datetime.now() >= tempo_limite,
+                ao_concluir=ao_concluir,
+            )
+            if pendentes:
+                if datetime.now() >= tempo_limite:
+                    if ui:
+                        print(f"\n\n{Fore.YELLOW}⏰ Tempo máximo de execução atingido.")
+                    logger.warning(f"Tempo máximo de execução atingido. {len(pendentes)} processo(s) não iniciados.")
+                else:
+                    logger.error(f"Nenhum worker disponível. {len(pendentes)} processo(s) não iniciados.")
+            return falhas, pendentes
+
+        # Processa cada processo; falhas de uma execução retomada voltam
+        # direto para a rodada de retry em que estavam
+        falhas_anteriores = set(checkpoint.falhas) if checkpoint else set()
+        primeira_passagem = [p for p in processos_unicos if p not in falhas_anteriores]
+        processos_falha, pendentes = processar_lote(primeira_passagem, "processando")
+        processos_falha |= falhas_anteriores & set(processos_unicos)
+        processos_falha |= confirmar_gravacao()
         
         # Retry para processos que falharam
-        for tentativa in range(2, max_retry_attempts + 1):
+        for tentativa in range(tentativa_inicial, max_retry_attempts + 1):
             if not processos_falha or datetime.now() >= tempo_limite:
                 break
+            if checkpoint:
+                checkpoint.definir_tentativa(tentativa, processos_falha)
             
             if ui:
                 print(f"\n\n{Fore.YELLOW}🔄 Tentativa {tentativa} para processos não atualizados ({len(processos_falha)} processos)...")
             logger.info(f"Iniciando tentativa {tentativa} para processos não atualizados...")
-            novos_falha = set()
-            
-            for j, proc in enumerate(list(processos_falha)):
-                if ui:
-                    ui.handle_pause()
-                    
-                if datetime.now() >= tempo_limite:
-                    if ui:
-                        print(f"\n{Fore.YELLOW}⏰ Tempo máximo atingido durante tentativas de repetição.")
-                    logger.warning("Tempo máximo atingido durante tentativas de repetição.")
-                    break
-                
-                if ui:
-                    ui.print_status(j+1, len(processos_falha), proc, "reprocessando")
-                
-                resultado = processar_processo(proc, driver, planilha_handler, config, logger, ui)
-                resultados.append(resultado)
-                tracker.update_stats(resultado["status"])
-                
-                if resultado["status"] == "falha":
-                    novos_falha.add(proc)
-                else:
-                    processos_falha.discard(proc)
-            
-            processos_falha = novos_falha
+            lote = [p for p in processos_unicos if p in processos_falha]
+            novos_falha, pendentes = processar_lote(lote, "reprocessando")
+            # Processos não iniciados por falta de tempo continuam pendentes
+            processos_falha = novos_falha | set(pendentes) | confirmar_gravacao()
+
+        # Mantém o checkpoint se o tempo acabou antes de todos serem tentados
+        # ou se ainda há linhas no buffer da planilha
+        if checkpoint:
+            tempo_esgotado = (pendentes or processos_falha) and datetime.now() >= tempo_limite
+            if tempo_esgotado or (planilha_handler and planilha_handler.pendentes):
+                logger.info(f"Checkpoint {checkpoint.run_id} mantido para a próxima execução")
+            else:
+                checkpoint.remover()
+        
+        # Notificações e relatórios rodam mesmo após o tempo limite
+        retry.definir_prazo(None)
         
         # Verifica mudanças e envia email se configurado
         if get_recipients(config, 'sei'):
@@ -1135,15 +2215,45 @@ def main() -> List[Dict[str, str]]:
     finally:
         if keyboard_handler:
             keyboard_handler.restore_signal_handler()
-        driver.quit()
+        latencias.registrar_resumo(logger)
+        estatisticas_captcha.registrar_resumo(logger)
+        if planilha_handler:
+            # Antes de salvar o estado: só linhas gravadas contam como sucesso
+            try:
+                nao_gravados = planilha_handler.descarregar()
+                if nao_gravados:
+                    logger.error(
+                        f"{len(nao_gravados)} processo(s) não gravados na planilha: {', '.join(nao_gravados)}"
+                    )
+            except Exception as e:
+                logger.error(f"Erro ao descarregar o buffer da planilha: {e}")
+            planilha_handler.fechar()
+        if estado_processos:
+            estado_processos.salvar()
+        cota_planilha.registrar_resumo(logger)
+        pool.fechar()
+        captcha_pipeline.fechar()
+        if captcha_amostras:
+            captcha_amostras.fechar()
         if ui:
             print(f"\n{Fore.CYAN}🔚 Recursos liberados. Obrigado por usar o PAINEEL!")
     
     return resultados
 
-def processar_processo(proc: str, driver, planilha_handler: Optional[PlanilhaHandler],
-                      config: ConfigManager, logger, ui: InteractiveUI = None) -> Dict[str, Any]:
-    """Processa um processo individual"""
+def processar_processo(proc: str, contexto: ContextoWorker, planilha_handler: Optional[PlanilhaHandler],
+                      config: ConfigManager, logger, ui: InteractiveUI = None,
+                      estado: Optional[ProcessStateStore] = None,
+                      ao_gravar: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """Processa um processo individual
+
+    Com ``estado`` informado, os sucessos são registrados nele e, no modo
+    incremental, a impressão digital dos andamentos é comparada com a da
+    última extração completa; se não mudou, a extração dos documentos e a
+    escrita na planilha são puladas.
+
+    ``ao_gravar(proc)`` é chamado quando a linha do processo chega de fato
+    à planilha, o que com ``write_behind`` pode ocorrer depois do retorno.
+    """
     if not validar_numero_processo(proc):
         if ui:
             print(f"{Fore.RED}  ❌ Processo inválido: {proc}")
@@ -1153,20 +2263,62 @@ def processar_processo(proc: str, driver, planilha_handler: Optional[PlanilhaHan
     if ui:
         print(f"\n{Fore.CYAN}📋 Processando: {Fore.WHITE}{proc}")
     logger.info(f"Processando: {proc}")
-    sei = SEIAneel(driver, config, logger, ui)
+    sei = None
     
+    dias_refresh = config.get('execution.full_refresh_days', 7)
+    incremental = config.get('execution.incremental', True)
+
+    def inalterado(impressao: str) -> bool:
+        if not incremental or estado is None or not estado.inalterado(proc, impressao, dias_refresh):
+            return False
+        estado.registrar_sucesso(proc, completa=False)
+        if ui:
+            print(f"{Fore.GREEN}  ⏭️  Sem novos andamentos")
+        logger.info(f"Processo {proc} sem novos andamentos ({impressao}); extração e escrita puladas")
+        return True
+
     try:
-        sucesso = sei.pesquisar_e_entrar_processo(proc)
-        if not sucesso:
+        dados_http = None
+        impressao = ""
+        if contexto.http:
+            try:
+                with latencias.etapa("http"):
+                    pagina = contexto.http.buscar_pagina(proc)
+                if pagina is None:
+                    if ui:
+                        print(f"{Fore.RED}  ❌ Processo não encontrado")
+                    logger.warning(f"Processo {proc} pulado após falha.")
+                    return {"processo": proc, "status": "falha"}
+                impressao = impressao_andamentos(pagina[0])
+                if inalterado(impressao):
+                    return {"processo": proc, "status": "inalterado"}
+                dados_http = parse_pagina_processo(*pagina)
+            except (HttpEngineError, ParserError) as e:
+                logger.warning(f"Motor HTTP falhou para {proc}: {e}. Usando Selenium.")
+
+        if dados_http:
+            detalhes = dados_http["detalhes"]
+            documentos = dados_http["documentos"]
+            andamentos = dados_http["andamentos"]
+        else:
+            sei = contexto.sei
+            sucesso = sei.pesquisar_e_entrar_processo(proc)
+            if not sucesso:
+                if ui:
+                    print(f"{Fore.RED}  ❌ Falha ao acessar processo")
+                logger.warning(f"Processo {proc} pulado após falha.")
+                return {"processo": proc, "status": "falha"}
+
+            html = sei.driver.page_source
+            impressao = impressao_andamentos(html)
+            if inalterado(impressao):
+                return {"processo": proc, "status": "inalterado"}
+
             if ui:
-                print(f"{Fore.RED}  ❌ Falha ao acessar processo")
-            logger.warning(f"Processo {proc} pulado após falha.")
-            return {"processo": proc, "status": "falha"}
-        
-        if ui:
-            print(f"{Fore.CYAN}  📄 Extraindo detalhes...")
-        detalhes = sei.extrair_detalhes_processo()
-        doc_nr, doc_tipo, doc_data, doc_incl, doc_uni, doc_links = sei.extrair_lista_protocolos_concatenado()
+                print(f"{Fore.CYAN}  📄 Extraindo detalhes...")
+            with latencias.etapa("extrair"):
+                detalhes, documentos, andamentos = sei.extrair_dados_processo(html)
+        doc_nr, doc_tipo, doc_data, doc_incl, doc_uni, doc_links = documentos
         doc_nr_list = doc_nr.split("\n") if doc_nr else []
         doc_link_list = doc_links.split("\n") if doc_links else []
 
@@ -1183,11 +2335,19 @@ def processar_processo(proc: str, driver, planilha_handler: Optional[PlanilhaHan
             doc_nr = "=" + "&CHAR(10)&".join(doc_formula_parts) if doc_formula_parts else ""
         else:
             doc_nr = "\n".join(doc_nr_list)
-        and_datas, and_unids, and_descrs = sei.extrair_andamentos_concatenado()
+        and_datas, and_unids, and_descrs = andamentos
 
+        # Interessados é validado antes da escrita; a busca redundante no HTML
+        # é repetida com esperas curtas caso a página ainda esteja montando
         interessados = detalhes.get("Interessados", "")
+        if not interessados and sei:
+            controle = retry.Retentativa("navegacao", logger=logger)
+            for _ in controle:
+                interessados = sei.buscar_interessados_redundante()
+                if interessados or not controle.aguardar(retry.ELEMENTO_AUSENTE):
+                    break
         if not interessados:
-            interessados = sei.buscar_interessados_redundante()
+            logger.warning(f"Interessados vazio para {detalhes.get('Processo', '') or proc}; linha gravada sem a coluna C")
 
         linha = [
             detalhes.get("Processo", ""),
@@ -1208,33 +2368,26 @@ def processar_processo(proc: str, driver, planilha_handler: Optional[PlanilhaHan
         if planilha_handler:
             if ui:
                 print(f"{Fore.CYAN}  💾 Salvando na planilha...")
-            status_inicial = None
-            col_c_val = ""
-            for tentativa in range(2):
-                status_atual = planilha_handler.atualizar_ou_inserir_processo(linha, detalhes.get("Processo", ""))
-                if status_inicial is None:
-                    status_inicial = status_atual
-                row_idx = planilha_handler.find_row_by_proc_number(detalhes.get("Processo", ""))
-                if row_idx:
-                    valor = planilha_handler.get_cell_value(row_idx, 3)
-                    if valor and valor.strip():
-                        col_c_val = valor
-                        break
-                if tentativa == 0:
-                    logger.warning(f"Coluna C vazia para {detalhes.get('Processo','')}, tentando novamente...")
-            if not col_c_val:
-                logger.warning(f"Coluna C permaneceu vazia para {detalhes.get('Processo','')} após 2 tentativas.")
-            status = status_inicial if status_inicial else status_atual
-
-        sei.captcha_handler.limpar_captchas()
+            # O estado só registra o sucesso quando a linha chega à planilha
+            def gravado():
+                if estado is not None:
+                    estado.registrar_sucesso(proc, impressao)
+                if ao_gravar:
+                    ao_gravar(proc)
+
+            with latencias.etapa("planilha"):
+                status = planilha_handler.atualizar_ou_inserir_processo(
+                    linha, detalhes.get("Processo", ""), gravado
+                )
 
         status_msg = (
             "✅ Atualizado" if status == "atualizado" else
             "📝 Inserido" if status == "inserido" else
             "✅ Processado" if status == "processado" else
+            "⏭️  Inalterado" if status == "inalterado" else
             "❌ Falha"
         )
-        status_color = Fore.GREEN if status in ["atualizado", "inserido", "processado"] else Fore.RED
+        status_color = Fore.GREEN if status in STATUS_SUCESSO else Fore.RED
 
         if ui:
             print(f"{status_color}  {status_msg}")
@@ -1246,10 +2399,12 @@ def processar_processo(proc: str, driver, planilha_handler: Optional[PlanilhaHan
         logger.error(f"Erro ao processar {proc}: {e}")
         return {"processo": proc, "status": "falha"}
     finally:
-        try:
-            driver.delete_all_cookies()
-        except:
-            pass
+        # Por padrão a sessão do SEI é mantida entre processos
+        if sei and config.get('execution.clear_cookies', False):
+            try:
+                sei.driver.delete_all_cookies()
+            except:
+                pass
 
 def verificar_e_enviar_notificacoes(planilha_handler: PlanilhaHandler, 
                                    processos_falha: List[str], 
@@ -1943,7 +3098,7 @@ if __name__ == "__main__":
     ensure_cron([5, 12, 17], __file__, "sei-aneel")
     try:
         resultados = main()
-        sucesso = len([r for r in resultados if r["status"] in ["atualizado", "inserido", "processado"]])
+        sucesso = len([r for r in resultados if r["status"] in STATUS_SUCESSO])
         total = len(resultados)
         
         print(f"\n{Fore.CYAN}{'='*50}")
@@ -436,12 +436,13 @@ PY
 config_exec() {
   read -p "Tentativas captcha [5]: " C; C=${C:-5}
   read -p "Tentativas reprocessamento [5]: " R; R=${R:-5}
-  python3 - "$CONFIG_FILE" "$C" "$R" <<'PY'
+  read -p "Navegadores paralelos [1]: " W; W=${W:-1}
+  python3 - "$CONFIG_FILE" "$C" "$R" "$W" <<'PY'
 import json,sys
-path,c,r=sys.argv[1:4]
+path,c,r,w=sys.argv[1:5]
 with open(path) as f: data=json.load(f)
 ex=data.setdefault('execution',{})
-ex.update({'captcha_max_tries':int(c),'max_retry_attempts':int(r)})
+ex.update({'captcha_max_tries':int(c),'max_retry_attempts':int(r),'workers':int(w)})
 with open(path,'w') as f: json.dump(data,f,indent=2)
 PY
 }
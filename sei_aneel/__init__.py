@@ -1,8 +1,26 @@
 """Core utilities for the PAINEEL automation project."""
 
 __all__ = [
+    "browser",
+    "captcha_model",
+    "captcha_pipeline",
+    "captcha_prefetch",
+    "captcha_preprocess",
+    "captcha_samples",
+    "captcha_stats",
+    "checkpoint",
+    "circuit_breaker",
     "email_utils",
+    "http_engine",
     "log_utils",
+    "ocr",
+    "process_state",
     "progress",
+    "quota",
+    "retry",
+    "sei_parser",
+    "sheet_mirror",
+    "timing",
     "ui",
+    "workers",
 ]
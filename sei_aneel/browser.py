@@ -0,0 +1,113 @@
+"""Utilitários de navegação Selenium compartilhados pelos workers."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Procura, em uma única chamada WebDriver, a âncora visível cujo texto contém
+# exatamente os dígitos do número do processo.
+_JS_LOCALIZAR_LINK = """
+var alvo = arguments[0];
+var links = document.getElementsByTagName('a');
+for (var i = 0; i < links.length; i++) {
+    var a = links[i];
+    var texto = a.textContent || '';
+    if (texto.replace(/\\D/g, '') === alvo && a.getClientRects().length > 0) {
+        return [a, texto.trim()];
+    }
+}
+return null;
+"""
+
+
+def localizar_link_processo(driver, numero_normalizado: str) -> Optional[Tuple[Any, str]]:
+    """Retorna ``(elemento, texto)`` do link do processo ou ``None``.
+
+    Substitui a varredura de todos os ``<a>`` da página (com ``.text`` e
+    ``.is_displayed()`` por âncora) por um único ``execute_script``.
+    """
+    resultado = driver.execute_script(_JS_LOCALIZAR_LINK, numero_normalizado)
+    if not resultado:
+        return None
+    return resultado[0], resultado[1]
+
+
+# Recursos dispensáveis para a extração.  O captcha é servido por um script
+# ``.php`` e não é afetado pelos padrões de imagem.
+RECURSOS_BLOQUEADOS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+    "*google-analytics.com*", "*googletagmanager.com*",
+    "*barra.sistema.gov.br*", "*vlibras.gov.br*",
+]
+
+_ARGUMENTOS_ENXUTOS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--metrics-recording-only",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+]
+
+
+def configurar_opcoes_enxutas(options) -> None:
+    """Ajusta ``options`` do Chrome para o perfil enxuto.
+
+    Usa a estratégia de carregamento ``eager`` (retorna após o
+    ``DOMContentLoaded``) e desativa extensões, rede em segundo plano e
+    atualização de componentes.
+    """
+    options.page_load_strategy = "eager"
+    for argumento in _ARGUMENTOS_ENXUTOS:
+        options.add_argument(argumento)
+
+
+def bloquear_recursos(driver, padroes=None) -> None:
+    """Bloqueia via CDP as requisições cujos URLs casam com ``padroes``."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(padroes or RECURSOS_BLOQUEADOS)})
+
+
+def medir_rss_navegador(driver) -> Optional[int]:
+    """Soma o RSS (bytes) do chromedriver e de todos os processos filhos.
+
+    Disponível apenas em sistemas com ``/proc`` (Linux); retorna ``None`` nos
+    demais ou se o PID do serviço não puder ser determinado.
+    """
+    try:
+        raiz = driver.service.process.pid
+    except Exception:
+        return None
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+
+    filhos: Dict[int, List[int]] = {}
+    rss: Dict[int, int] = {}
+    for entrada in proc.iterdir():
+        if not entrada.name.isdigit():
+            continue
+        try:
+            status = (entrada / "status").read_text()
+        except OSError:
+            continue
+        campos = dict(
+            linha.split(":", 1) for linha in status.splitlines() if ":" in linha
+        )
+        pid = int(entrada.name)
+        filhos.setdefault(int(campos.get("PPid", "0").strip() or 0), []).append(pid)
+        valor = campos.get("VmRSS", "0 kB").split()
+        rss[pid] = int(valor[0]) * 1024 if valor else 0
+
+    total = 0
+    pendentes = [raiz]
+    while pendentes:
+        pid = pendentes.pop()
+        total += rss.get(pid, 0)
+        pendentes.extend(filhos.get(pid, []))
+    return total
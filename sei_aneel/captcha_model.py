@@ -0,0 +1,236 @@
+"""Classificador leve de captcha treinado com as amostras coletadas.
+
+O captcha é binarizado (Otsu, sem as linhas finas de ruído) e dividido em
+caracteres pela projeção das colunas: cada trecho contínuo de colunas com
+pixels escuros é um caractere.  Trechos são unidos ou divididos até chegar
+ao tamanho esperado, quando conhecido.  Cada caractere é recortado,
+centralizado em um quadrado e reduzido a 16x16; a classificação é um k-NN
+sobre esses vetores, feito com uma única multiplicação de matrizes NumPy.
+
+O modelo é um ``.npz`` com os vetores e rótulos de treino, gerado a partir
+das amostras aceitas pelo SEI em :mod:`sei_aneel.captcha_samples`::
+
+    python -m sei_aneel.captcha_model treinar [--db CAMINHO] [--saida CAMINHO] [--k 5]
+
+O arquivo é carregado uma única vez por processo (:func:`obter_modelo`).
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import platform
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from .captcha_preprocess import escala_de_cinza, limiar_otsu, remover_linhas
+from .ocr import carregar_imagem
+
+LADO = 16  # caracteres normalizados para LADO x LADO
+MASSA_MINIMA = 8  # trechos com menos pixels escuros são ruído
+
+_cache: Dict[Path, "ModeloCaptcha"] = {}
+_cache_lock = threading.Lock()
+
+
+def caminho_padrao() -> Path:
+    """Modelo em ``data/`` seguindo a mesma convenção do script principal."""
+    if platform.system() == "Windows":
+        return Path(os.getcwd()) / "data" / "captcha_model.npz"
+    return Path("/opt/sei-aneel/data/captcha_model.npz")
+
+
+def _trechos(ativas: np.ndarray) -> List[Tuple[int, int]]:
+    """Intervalos ``[início, fim)`` de valores verdadeiros consecutivos."""
+    borda = np.diff(np.concatenate(([0], ativas.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(borda == 1).tolist(), np.flatnonzero(borda == -1).tolist()))
+
+
+def _ajustar(trechos: List[Tuple[int, int]], tamanho: Optional[int]) -> List[Tuple[int, int]]:
+    """Une ou divide trechos até obter ``tamanho`` caracteres.
+
+    Sem tamanho conhecido, só divide trechos bem mais largos que a mediana
+    (caracteres encostados).
+    """
+    trechos = list(trechos)
+    if not trechos:
+        return trechos
+    if tamanho is None:
+        mediana = float(np.median([fim - ini for ini, fim in trechos]))
+        ajustados = []
+        for ini, fim in trechos:
+            partes = max(1, round((fim - ini) / mediana)) if fim - ini > 1.6 * mediana else 1
+            limites = np.linspace(ini, fim, partes + 1).round().astype(int).tolist()
+            ajustados.extend(zip(limites[:-1], limites[1:]))
+        return ajustados
+    while len(trechos) > tamanho:
+        i = min(range(len(trechos) - 1), key=lambda j: trechos[j + 1][0] - trechos[j][1])
+        trechos[i:i + 2] = [(trechos[i][0], trechos[i + 1][1])]
+    while len(trechos) < tamanho:
+        i = max(range(len(trechos)), key=lambda j: trechos[j][1] - trechos[j][0])
+        ini, fim = trechos[i]
+        if fim - ini < 2:
+            break
+        meio = (ini + fim) // 2
+        trechos[i:i + 1] = [(ini, meio), (meio, fim)]
+    return trechos
+
+
+def _normalizar(caractere: np.ndarray) -> np.ndarray:
+    """Recorta, centraliza em um quadrado e reduz para ``LADO x LADO``."""
+    linhas = np.flatnonzero(caractere.any(axis=1))
+    caractere = caractere[linhas[0]:linhas[-1] + 1]
+    altura, largura = caractere.shape
+    lado = max(altura, largura)
+    quadrado = np.zeros((lado, lado), dtype=np.uint8)
+    topo, esquerda = (lado - altura) // 2, (lado - largura) // 2
+    quadrado[topo:topo + altura, esquerda:esquerda + largura] = caractere * 255
+    reduzido = Image.fromarray(quadrado).resize((LADO, LADO), Image.BILINEAR)
+    return np.asarray(reduzido, dtype=np.float32).ravel() / 255.0
+
+
+def segmentar(imagem: Union[bytes, Image.Image], tamanho: Optional[int] = None) -> np.ndarray:
+    """Vetores ``(caracteres, LADO*LADO)`` dos caracteres do captcha, da esquerda para a direita."""
+    cinza = escala_de_cinza(carregar_imagem(imagem))
+    escuro = remover_linhas(cinza <= limiar_otsu(cinza))
+    trechos = [
+        (ini, fim) for ini, fim in _trechos(escuro.sum(axis=0) > 0)
+        if escuro[:, ini:fim].sum() >= MASSA_MINIMA
+    ]
+    trechos = [(ini, fim) for ini, fim in _ajustar(trechos, tamanho) if escuro[:, ini:fim].any()]
+    if not trechos:
+        return np.zeros((0, LADO * LADO), dtype=np.float32)
+    return np.stack([_normalizar(escuro[:, ini:fim]) for ini, fim in trechos])
+
+
+class ModeloCaptcha:
+    """k-NN sobre caracteres segmentados."""
+
+    def __init__(self, vetores: np.ndarray, rotulos: np.ndarray, k: int = 5):
+        self.vetores = np.asarray(vetores, dtype=np.float32)
+        self.rotulos = np.asarray(rotulos)
+        self.k = max(1, min(int(k), len(self.rotulos)))
+        self._normas = (self.vetores ** 2).sum(axis=1)
+
+    @classmethod
+    def treinar(cls, amostras: Sequence[Tuple[bytes, str]], k: int = 5) -> "ModeloCaptcha":
+        """Treina com pares (imagem, resposta); amostras mal segmentadas são ignoradas."""
+        vetores, rotulos = [], []
+        for imagem, resposta in amostras:
+            try:
+                caracteres = segmentar(imagem, len(resposta))
+            except Exception:
+                continue
+            if len(caracteres) != len(resposta):
+                continue
+            vetores.append(caracteres)
+            rotulos.extend(resposta)
+        if not vetores:
+            raise ValueError("nenhuma amostra pôde ser segmentada")
+        return cls(np.concatenate(vetores), np.array(rotulos, dtype="<U1"), k)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> "ModeloCaptcha":
+        with np.load(str(caminho), allow_pickle=False) as dados:
+            return cls(dados["vetores"], dados["rotulos"], int(dados["k"]))
+
+    def salvar(self, caminho: Path) -> None:
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "wb") as f:
+            np.savez_compressed(f, vetores=self.vetores, rotulos=self.rotulos, k=np.array(self.k))
+
+    def classificar(self, caracteres: np.ndarray) -> List[Tuple[str, float]]:
+        """Rótulo e fração de vizinhos concordantes (0-100) de cada caractere."""
+        if not len(caracteres):
+            return []
+        distancias = (
+            (caracteres ** 2).sum(axis=1)[:, None] + self._normas[None, :] - 2.0 * caracteres @ self.vetores.T
+        )
+        vizinhos = np.argpartition(distancias, self.k - 1, axis=1)[:, :self.k]
+        resultado = []
+        for linha, indices in zip(distancias, vizinhos):
+            indices = indices[np.argsort(linha[indices])]
+            votos = Counter(self.rotulos[indices].tolist())
+            # empate: vence o rótulo do vizinho mais próximo entre os mais votados
+            maximo = max(votos.values())
+            rotulo = next(r for r in self.rotulos[indices].tolist() if votos[r] == maximo)
+            resultado.append((rotulo, 100.0 * maximo / self.k))
+        return resultado
+
+    def reconhecer(self, imagem: Union[bytes, Image.Image], tamanho: Optional[int] = None) -> Tuple[str, float]:
+        """Texto do captcha e a confiança (menor entre os caracteres, 0-100)."""
+        classes = self.classificar(segmentar(imagem, tamanho))
+        if not classes:
+            return "", 0.0
+        return "".join(r for r, _ in classes), min(c for _, c in classes)
+
+
+def obter_modelo(caminho: Optional[Path] = None) -> ModeloCaptcha:
+    """Modelo em ``caminho``, lido do disco apenas na primeira chamada."""
+    caminho = Path(caminho or caminho_padrao())
+    with _cache_lock:
+        modelo = _cache.get(caminho)
+        if modelo is None:
+            modelo = _cache[caminho] = ModeloCaptcha.carregar(caminho)
+        return modelo
+
+
+def avaliar(modelo: ModeloCaptcha, amostras: Sequence[Tuple[bytes, str]],
+            tamanho: Optional[int] = None) -> Tuple[float, float]:
+    """Acurácia (resposta inteira) e tempo médio por captcha em ms."""
+    if not amostras:
+        return 0.0, 0.0
+    acertos = 0
+    inicio = time.perf_counter()
+    for imagem, resposta in amostras:
+        acertos += modelo.reconhecer(imagem, tamanho)[0] == resposta
+    return acertos / len(amostras), (time.perf_counter() - inicio) * 1000 / len(amostras)
+
+
+def main(argv=None) -> None:
+    from .captcha_samples import CaptchaSampleStore
+
+    parser = argparse.ArgumentParser(description="Modelo local de captcha do PAINEEL")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    treinar = comandos.add_parser("treinar", help="Treina com as amostras aceitas pelo SEI")
+    treinar.add_argument("--db", type=Path, default=None, help="Banco de amostras (captcha_samples.sqlite)")
+    treinar.add_argument("--saida", type=Path, default=None, help="Arquivo .npz do modelo")
+    treinar.add_argument("--k", type=int, default=5, help="Vizinhos consultados por caractere")
+    treinar.add_argument("--tamanho", type=int, default=None, help="Tamanho fixo do captcha (captcha.length)")
+    treinar.add_argument("--validacao", type=float, default=0.2, help="Fração separada para validação")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = CaptchaSampleStore(args.db)
+    try:
+        amostras = store.rotuladas()
+    finally:
+        store.fechar()
+    if not amostras:
+        print("Nenhuma amostra aceita no banco; execute o PAINEEL com captcha.collect_samples ativo.")
+        return
+
+    embaralhadas = list(amostras)
+    random.Random(0).shuffle(embaralhadas)
+    corte = int(len(embaralhadas) * args.validacao)
+    if corte:
+        modelo = ModeloCaptcha.treinar(embaralhadas[corte:], args.k)
+        acuracia, ms = avaliar(modelo, embaralhadas[:corte], args.tamanho)
+        print(f"Validação: {corte} captchas, acurácia {acuracia * 100:.1f}%, {ms:.1f} ms/captcha")
+
+    modelo = ModeloCaptcha.treinar(amostras, args.k)
+    saida = args.saida or caminho_padrao()
+    modelo.salvar(saida)
+    print(f"Modelo com {len(modelo.rotulos)} caracteres de {len(amostras)} amostras salvo em {saida}")
+
+
+if __name__ == "__main__":
+    main()
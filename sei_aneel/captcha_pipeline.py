@@ -0,0 +1,213 @@
+"""Resolução assíncrona de captchas no 2captcha.
+
+``TwoCaptcha.normal()`` envia a imagem e dorme ``pollingInterval`` segundos
+(10 por padrão) entre consultas, bloqueando o chamador.  Aqui o envio
+(``in.php``) devolve imediatamente um :class:`~concurrent.futures.Future` e uma
+única thread consulta (``res.php``) todos os captchas pendentes de todos os
+workers, em intervalos curtos, resolvendo cada ``Future`` assim que a resposta
+fica pronta.
+
+Um :class:`~sei_aneel.circuit_breaker.CircuitBreaker` protege o serviço:
+após falhas consecutivas (erro de envio, de consulta ou sem resposta no
+prazo) ou saldo esgotado, :meth:`CaptchaPipeline.enviar` recusa os captchas
+na hora com :class:`~sei_aneel.circuit_breaker.CircuitoAberto` e o chamador
+passa direto ao OCR local.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from twocaptcha.api import ApiException, NetworkException
+
+from .circuit_breaker import CircuitBreaker
+from .timing import latencias
+
+URL_SALDO = "https://2captcha.com/res.php"
+# Erros do 2captcha que não indicam problema no serviço, só no captcha enviado
+_ERROS_DO_CAPTCHA = ("ERROR_CAPTCHA_UNSOLVABLE", "ERROR_BAD_DUPLICATES", "ERROR_WRONG_CAPTCHA_ID")
+
+
+def consultar_saldo(api_key: str, timeout: float = 10) -> float:
+    """Saldo da conta do 2captcha (``res.php?action=getbalance``).
+
+    Raises:
+        ValueError: Se o 2captcha responder com erro (ex.: chave inválida).
+        OSError: Em falha de rede.
+    """
+    consulta = urllib.parse.urlencode({"key": api_key, "action": "getbalance"})
+    with urllib.request.urlopen(f"{URL_SALDO}?{consulta}", timeout=timeout) as resp:
+        texto = resp.read().decode().strip()
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(texto) from None
+
+
+class _Pendente:
+    __slots__ = ("future", "enviado", "proxima_consulta")
+
+    def __init__(self, future: Future, enviado: float, proxima_consulta: float):
+        self.future = future
+        self.enviado = enviado
+        self.proxima_consulta = proxima_consulta
+
+
+class CaptchaPipeline:
+    """Envia captchas ao 2captcha sem bloquear e consulta as respostas em segundo plano.
+
+    Args:
+        solver: Instância de ``twocaptcha.TwoCaptcha``.
+        atraso_inicial: Segundos até a primeira consulta (o 2captcha raramente
+            responde antes de ~5 s).
+        intervalo: Segundos entre consultas de um mesmo captcha.
+        timeout: Tempo máximo de espera por uma resposta.
+        disjuntor: Circuito do serviço; por padrão abre após 3 falhas e
+            testa o serviço a cada 60 s.
+    """
+
+    def __init__(self, solver, logger: Optional[logging.Logger] = None,
+                 atraso_inicial: float = 5, intervalo: float = 2, timeout: float = 120,
+                 disjuntor: Optional[CircuitBreaker] = None):
+        self.solver = solver
+        self.logger = logger or logging.getLogger(__name__)
+        self.atraso_inicial = atraso_inicial
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self.disjuntor = disjuntor or CircuitBreaker("2captcha", logger=self.logger)
+        self._pendentes: Dict[str, _Pendente] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._encerrado = False
+
+    def enviar(self, imagem: str, **parametros) -> Future:
+        """Envia ``imagem`` (caminho ou base64) e retorna o ``Future`` da resposta.
+
+        O ``Future`` recebe o texto do captcha ou a exceção do 2captcha; o id
+        do captcha fica no atributo ``captcha_id``.
+
+        Raises:
+            CircuitoAberto: Se o serviço está com o circuito aberto.
+        """
+        metodo = self.solver.get_method(imagem)
+        self.disjuntor.verificar()
+        try:
+            captcha_id = self.solver.send(**metodo, **parametros)
+        except Exception as e:
+            self._registrar_falha(e)
+            raise
+        agora = time.monotonic()
+        future: Future = Future()
+        future.captcha_id = captcha_id  # type: ignore[attr-defined]
+        with self._cond:
+            if self._encerrado:
+                raise RuntimeError("pipeline de captcha encerrado")
+            self._pendentes[captcha_id] = _Pendente(future, agora, agora + self.atraso_inicial)
+            self._garantir_thread()
+            self._cond.notify()
+        return future
+
+    def _garantir_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._consultar, name="captcha-poller", daemon=True)
+            self._thread.start()
+
+    def _consultar(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pendentes and not self._encerrado:
+                    self._cond.wait()
+                if self._encerrado:
+                    return
+                agora = time.monotonic()
+                proxima = min(p.proxima_consulta for p in self._pendentes.values())
+                if proxima > agora:
+                    self._cond.wait(proxima - agora)
+                    continue
+                prontos = [(i, p) for i, p in self._pendentes.items() if p.proxima_consulta <= agora]
+
+            for captcha_id, pendente in prontos:
+                self._consultar_um(captcha_id, pendente)
+
+    def _consultar_um(self, captcha_id: str, pendente: _Pendente) -> None:
+        decorrido = time.monotonic() - pendente.enviado
+        try:
+            resposta = self.solver.get_result(captcha_id)
+        except NetworkException:
+            # Ainda não resolvido (CAPCHA_NOT_READY) ou falha de rede transitória
+            if decorrido < self.timeout:
+                pendente.proxima_consulta = time.monotonic() + self.intervalo
+                return
+            erro = TimeoutError(f"captcha {captcha_id} sem resposta em {self.timeout}s")
+            self._registrar_falha(erro)
+            self._finalizar(captcha_id, excecao=erro)
+        except ApiException as e:
+            if any(codigo in str(e) for codigo in _ERROS_DO_CAPTCHA):
+                self.disjuntor.registrar_sucesso()
+            else:
+                self._registrar_falha(e)
+            self._finalizar(captcha_id, excecao=e)
+        except Exception as e:
+            self.logger.warning(f"Erro ao consultar captcha {captcha_id}: {e}")
+            self._registrar_falha(e)
+            self._finalizar(captcha_id, excecao=e)
+        else:
+            latencias.registrar("captcha_2captcha", decorrido)
+            self.disjuntor.registrar_sucesso()
+            self._finalizar(captcha_id, resultado=resposta)
+
+    def _registrar_falha(self, erro: BaseException) -> None:
+        if "ERROR_ZERO_BALANCE" in str(erro):
+            self.disjuntor.abrir("saldo esgotado", self.disjuntor.intervalo_sonda * 10)
+        else:
+            self.disjuntor.registrar_falha(str(erro) or type(erro).__name__)
+
+    def verificar_saldo(self, minimo: float = 0.0) -> Optional[float]:
+        """Consulta o saldo e abre o circuito se não houver saldo para resolver captchas.
+
+        Returns:
+            O saldo, ou ``None`` se a consulta falhou.
+        """
+        try:
+            saldo = consultar_saldo(self.solver.API_KEY)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível consultar o saldo do 2captcha: {e}")
+            self._registrar_falha(e)
+            return None
+        self.logger.info(f"Saldo do 2captcha: {saldo:.4f}")
+        if saldo <= minimo:
+            self.disjuntor.abrir(f"saldo {saldo:.4f} abaixo do mínimo {minimo}", float("inf"))
+        return saldo
+
+    def _finalizar(self, captcha_id: str, resultado: Optional[str] = None,
+                   excecao: Optional[BaseException] = None) -> None:
+        with self._cond:
+            pendente = self._pendentes.pop(captcha_id, None)
+        if pendente is None or pendente.future.done():
+            return
+        if excecao is not None:
+            pendente.future.set_exception(excecao)
+        else:
+            pendente.future.set_result(resultado)
+
+    def reportar(self, captcha_id: str, correto: bool) -> None:
+        """Informa ao 2captcha se a resposta foi aceita pelo SEI."""
+        try:
+            self.solver.report(captcha_id, correto)
+        except Exception as e:
+            self.logger.debug(f"Erro ao reportar captcha {captcha_id}: {e}")
+
+    def fechar(self) -> None:
+        """Encerra a thread de consulta; captchas pendentes são cancelados."""
+        with self._cond:
+            self._encerrado = True
+            pendentes = list(self._pendentes.values())
+            self._pendentes.clear()
+            self._cond.notify_all()
+        for pendente in pendentes:
+            pendente.future.cancel()
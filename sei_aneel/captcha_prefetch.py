@@ -0,0 +1,106 @@
+"""Resolução antecipada do próximo captcha de um worker.
+
+Depois de abrir um processo, o formulário de pesquisa já exibe um captcha
+novo.  O worker pode resolvê-lo em segundo plano enquanto extrai o processo
+atual e grava a planilha; na pesquisa seguinte a resposta já está pronta.
+
+Cada worker tem o seu :class:`CaptchaPrefetch` (o captcha é vinculado à
+sessão do SEI) com no máximo uma resposta pendente, descartada após
+``ttl`` segundos.  Nenhuma espera pela resolução passa desse prazo: um
+solver travado conta como captcha não antecipado.  Com ``ha_proximo``, o
+captcha não é antecipado quando não há outro processo na fila.
+
+O resolvedor devolve a resposta e sua origem (solver, amostra...) sem
+alterar o estado compartilhado; ``ao_usar`` recebe a origem só quando a
+resposta é entregue.  Uma resolução abandonada que termine depois não
+interfere na resposta em uso.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturoTimeout
+from typing import Any, Callable, Optional, Tuple
+
+
+class CaptchaPrefetch:
+    """Uma resolução de captcha em andamento, com prazo de validade."""
+
+    def __init__(self, resolver: Callable[[bytes, int], Tuple[str, Any]], ttl: float = 120,
+                 logger: Optional[logging.Logger] = None,
+                 ha_proximo: Optional[Callable[[], bool]] = None,
+                 ao_usar: Optional[Callable[[Any], None]] = None):
+        self.resolver = resolver
+        self.ttl = ttl
+        self.ha_proximo = ha_proximo
+        self.ao_usar = ao_usar
+        self.logger = logger or logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="captcha-prefetch")
+        self._pendente: Optional[Tuple[Future, float, Any]] = None
+
+    def deve_antecipar(self) -> bool:
+        """Indica se vale resolver o próximo captcha (há processo na fila)."""
+        return self.ha_proximo is None or self.ha_proximo()
+
+    def iniciar(self, captcha_bytes: bytes, contexto: Any = None) -> None:
+        """Começa a resolver ``captcha_bytes`` em segundo plano.
+
+        ``contexto`` identifica o captcha (por exemplo, o formulário ou o
+        elemento da imagem) e é devolvido junto com a resposta.
+        """
+        self.descartar()
+        futuro = self._executor.submit(self.resolver, captcha_bytes, 1)
+        self._pendente = (futuro, time.monotonic() + self.ttl, contexto)
+
+    def obter(self) -> Optional[Tuple[str, Any]]:
+        """Resposta e contexto do captcha antecipado, ou ``None``.
+
+        Aguarda a resolução se ainda estiver em andamento, no máximo até o
+        vencimento.  Respostas vencidas ou vazias são descartadas; a origem
+        da resposta entregue é passada a ``ao_usar``.
+        """
+        if self._pendente is None:
+            return None
+        futuro, expira, contexto = self._pendente
+        self._pendente = None
+        try:
+            texto, origem = futuro.result(timeout=max(0.0, expira - time.monotonic()))
+        except FuturoTimeout:
+            self.logger.debug("Captcha antecipado não resolvido dentro da validade; descartado")
+            return None
+        except Exception as e:
+            self.logger.debug(f"Captcha antecipado falhou: {e}")
+            return None
+        if not texto:
+            return None
+        if time.monotonic() > expira:
+            self.logger.debug("Captcha antecipado vencido; descartado")
+            return None
+        if self.ao_usar:
+            self.ao_usar(origem)
+        return texto, contexto
+
+    def descartar(self) -> None:
+        """Abandona a resposta pendente, esperando a resolução terminar.
+
+        A espera não passa do vencimento; uma resolução que termine depois
+        é ignorada, pois sua origem nunca chega a ``ao_usar``.
+        """
+        if self._pendente is None:
+            return
+        futuro, expira, _ = self._pendente
+        self._pendente = None
+        if not futuro.cancel():
+            try:
+                futuro.result(timeout=max(0.0, expira - time.monotonic()))
+            except Exception:
+                pass
+
+    @property
+    def pendente(self) -> bool:
+        return self._pendente is not None
+
+    def fechar(self) -> None:
+        self.descartar()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,105 @@
+"""Pré-processamento vetorizado do captcha em várias variantes.
+
+A partir da imagem em escala de cinza gera, com operações NumPy sobre a
+matriz inteira, candidatos binarizados por métodos diferentes:
+
+* ``fixo``: limiar 130 (o tratamento original, para comparação);
+* ``otsu``: limiar global escolhido pelo método de Otsu;
+* ``adaptativo``: limiar pela média local (janela via imagem integral);
+* ``sem_linhas``: Otsu sem as linhas finas de ruído que cruzam o captcha.
+
+Todos são ampliados (o Tesseract erra menos com caracteres maiores) e passam
+por um filtro de maioria 3x3.  O OCR roda sobre todos e a resposta é escolhida
+por votação em :mod:`sei_aneel.ocr`.
+"""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image
+
+LIMIAR_FIXO = 130
+
+
+def escala_de_cinza(img: Image.Image) -> np.ndarray:
+    """Matriz ``float32`` em escala de cinza com contraste esticado para 0-255."""
+    cinza = np.asarray(img.convert("L"), dtype=np.float32)
+    minimo, maximo = float(cinza.min()), float(cinza.max())
+    if maximo - minimo < 1:
+        return cinza
+    return (cinza - minimo) * (255.0 / (maximo - minimo))
+
+
+def limiar_otsu(cinza: np.ndarray) -> float:
+    """Limiar que maximiza a variância entre as classes fundo/texto."""
+    hist = np.bincount(np.clip(cinza, 0, 255).astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    prob = hist / hist.sum()
+    omega = np.cumsum(prob)
+    mu = np.cumsum(prob * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variancia = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    return float(np.argmax(np.nan_to_num(variancia)))
+
+
+def media_local(cinza: np.ndarray, janela: int = 15) -> np.ndarray:
+    """Média em janela ``janela x janela`` calculada pela imagem integral."""
+    raio = janela // 2
+    lado = 2 * raio + 1
+    integral = np.pad(cinza, ((raio + 1, raio), (raio + 1, raio)), mode="edge").cumsum(0).cumsum(1)
+    soma = integral[lado:, lado:] - integral[:-lado, lado:] - integral[lado:, :-lado] + integral[:-lado, :-lado]
+    return soma / (lado * lado)
+
+
+def _deslocar(mascara: np.ndarray, dy: int, dx: int) -> np.ndarray:
+    """``mascara`` deslocada; o que sai da borda é preenchido com ``False``."""
+    altura, largura = mascara.shape
+    resultado = np.zeros_like(mascara)
+    resultado[max(dy, 0):altura + min(dy, 0), max(dx, 0):largura + min(dx, 0)] = \
+        mascara[max(-dy, 0):altura + min(-dy, 0), max(-dx, 0):largura + min(-dx, 0)]
+    return resultado
+
+
+def remover_linhas(escuro: np.ndarray) -> np.ndarray:
+    """Apaga traços de 1 pixel de espessura (linhas de ruído)."""
+    horizontal = ~_deslocar(escuro, 1, 0) & ~_deslocar(escuro, -1, 0)
+    vertical = ~_deslocar(escuro, 0, 1) & ~_deslocar(escuro, 0, -1)
+    return escuro & ~horizontal & ~vertical
+
+
+def filtro_maioria(escuro: np.ndarray) -> np.ndarray:
+    """Pixel fica escuro se ao menos 5 dos 9 da vizinhança 3x3 forem escuros."""
+    contagem = sum(
+        _deslocar(escuro, dy, dx).astype(np.uint8)
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+    )
+    return contagem >= 5
+
+
+def _ampliar(matriz: np.ndarray, escala: int) -> np.ndarray:
+    return np.repeat(np.repeat(matriz, escala, axis=0), escala, axis=1)
+
+
+def _imagem(escuro: np.ndarray) -> Image.Image:
+    """Texto preto sobre fundo branco, como o Tesseract espera."""
+    return Image.fromarray(np.where(escuro, 0, 255).astype(np.uint8))
+
+
+def candidatos(img: Image.Image, escala: int = 2) -> List[Tuple[str, Image.Image]]:
+    """Variantes binarizadas de ``img`` para reconhecimento em lote."""
+    cinza = escala_de_cinza(img)
+    ampliada = np.asarray(
+        Image.fromarray(cinza.astype(np.uint8)).resize(
+            (cinza.shape[1] * escala, cinza.shape[0] * escala), Image.BICUBIC
+        ),
+        dtype=np.float32,
+    )
+    otsu = limiar_otsu(cinza)
+    variantes = {
+        "fixo": ampliada <= LIMIAR_FIXO,
+        "otsu": ampliada <= otsu,
+        "adaptativo": ampliada < media_local(ampliada, 15 * escala) - 10,
+        "sem_linhas": _ampliar(remover_linhas(cinza <= otsu), escala),
+    }
+    return [(nome, _imagem(filtro_maioria(escuro))) for nome, escuro in variantes.items()]
@@ -0,0 +1,186 @@
+"""Registro local das respostas de captcha e do retorno do SEI.
+
+Cada captcha resolvido vira uma linha em um banco SQLite com o hash e a
+imagem, o solver usado, a resposta, a latência, a confiança (OCR local) e,
+depois da pesquisa, se o SEI aceitou a resposta.  As amostras aceitas formam
+um conjunto rotulado para ajustar o OCR local e treinar o modelo de
+:mod:`sei_aneel.captcha_model`.
+
+Uso em linha de comando::
+
+    python -m sei_aneel.captcha_samples relatorio [--db CAMINHO]
+    python -m sei_aneel.captcha_samples exportar DESTINO [--db CAMINHO] [--todos]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import platform
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .timing import percentil
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS amostras (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    criado TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    resposta TEXT NOT NULL,
+    latencia REAL,
+    confianca REAL,
+    aceito INTEGER,
+    imagem BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_amostras_solver ON amostras (solver, aceito);
+"""
+
+
+def caminho_padrao() -> Path:
+    """Banco em ``data/`` seguindo a mesma convenção do script principal."""
+    if platform.system() == "Windows":
+        return Path(os.getcwd()) / "data" / "captcha_samples.sqlite"
+    return Path("/opt/sei-aneel/data/captcha_samples.sqlite")
+
+
+class CaptchaSampleStore:
+    """Banco SQLite de amostras de captcha, seguro para várias threads."""
+
+    def __init__(self, caminho: Optional[Path] = None, logger: Optional[logging.Logger] = None):
+        self.caminho = Path(caminho or caminho_padrao())
+        self.logger = logger or logging.getLogger(__name__)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conexao.executescript(_ESQUEMA)
+
+    def registrar(self, imagem: bytes, solver: str, resposta: str,
+                  latencia: Optional[float] = None, confianca: Optional[float] = None) -> Optional[int]:
+        """Grava uma resposta entregue ao SEI e retorna o id da amostra."""
+        try:
+            with self._lock, self._conexao:
+                cursor = self._conexao.execute(
+                    "INSERT INTO amostras (criado, sha1, solver, resposta, latencia, confianca, imagem) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        datetime.now().isoformat(timespec="seconds"),
+                        hashlib.sha1(imagem).hexdigest(),
+                        solver,
+                        resposta,
+                        latencia,
+                        confianca,
+                        sqlite3.Binary(imagem),
+                    ),
+                )
+                return cursor.lastrowid
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erro ao registrar amostra de captcha: {e}")
+            return None
+
+    def marcar(self, amostra_id: int, aceito: bool) -> None:
+        """Registra se o SEI aceitou a resposta da amostra."""
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute("UPDATE amostras SET aceito = ? WHERE id = ?", (int(aceito), amostra_id))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erro ao atualizar amostra de captcha: {e}")
+
+    def podar(self, dias: float) -> int:
+        """Remove amostras com mais de ``dias`` dias; retorna quantas."""
+        limite = (datetime.now() - timedelta(days=dias)).isoformat(timespec="seconds")
+        with self._lock, self._conexao:
+            return self._conexao.execute("DELETE FROM amostras WHERE criado < ?", (limite,)).rowcount
+
+    def relatorio(self) -> Dict[str, Dict[str, float]]:
+        """Acurácia e percentis de latência por solver."""
+        with self._lock:
+            linhas = self._conexao.execute("SELECT solver, aceito, latencia FROM amostras").fetchall()
+        por_solver: Dict[str, Dict[str, list]] = {}
+        for solver, aceito, latencia in linhas:
+            dados = por_solver.setdefault(solver, {"aceito": [], "latencia": []})
+            dados["aceito"].append(aceito)
+            if latencia is not None:
+                dados["latencia"].append(latencia)
+        resultado = {}
+        for solver, dados in por_solver.items():
+            aceitos = sum(1 for a in dados["aceito"] if a == 1)
+            rejeitados = sum(1 for a in dados["aceito"] if a == 0)
+            avaliados = aceitos + rejeitados
+            resultado[solver] = {
+                "total": len(dados["aceito"]),
+                "aceitos": aceitos,
+                "rejeitados": rejeitados,
+                "acuracia": aceitos / avaliados if avaliados else 0.0,
+                "p50": percentil(dados["latencia"], 50),
+                "p95": percentil(dados["latencia"], 95),
+            }
+        return resultado
+
+    def rotuladas(self) -> List[Tuple[bytes, str]]:
+        """Imagem e resposta das amostras aceitas pelo SEI, em ordem de coleta."""
+        with self._lock:
+            return self._conexao.execute(
+                "SELECT imagem, resposta FROM amostras WHERE aceito = 1 ORDER BY id"
+            ).fetchall()
+
+    def exportar(self, destino: Path, apenas_aceitos: bool = True) -> int:
+        """Exporta as imagens e um ``labels.csv`` (arquivo, resposta, solver)."""
+        destino = Path(destino)
+        destino.mkdir(parents=True, exist_ok=True)
+        consulta = "SELECT id, resposta, solver, aceito, imagem FROM amostras"
+        if apenas_aceitos:
+            consulta += " WHERE aceito = 1"
+        with self._lock:
+            linhas = self._conexao.execute(consulta + " ORDER BY id").fetchall()
+        with open(destino / "labels.csv", "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["arquivo", "resposta", "solver", "aceito"])
+            for amostra_id, resposta, solver, aceito, imagem in linhas:
+                arquivo = f"{amostra_id:06d}_{resposta}.png"
+                (destino / arquivo).write_bytes(imagem)
+                escritor.writerow([arquivo, resposta, solver, "" if aceito is None else aceito])
+        return len(linhas)
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._conexao.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Amostras de captcha coletadas pelo PAINEEL")
+    parser.add_argument("--db", type=Path, default=None, help="Caminho do banco SQLite")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("relatorio", help="Acurácia e latência por solver")
+    exportar = comandos.add_parser("exportar", help="Exporta amostras rotuladas")
+    exportar.add_argument("destino", type=Path)
+    exportar.add_argument("--todos", action="store_true", help="Inclui amostras rejeitadas ou não avaliadas")
+    args = parser.parse_args(argv)
+
+    store = CaptchaSampleStore(args.db)
+    try:
+        if args.comando == "relatorio":
+            relatorio = store.relatorio()
+            if not relatorio:
+                print("Nenhuma amostra registrada.")
+            for solver, est in sorted(relatorio.items()):
+                print(
+                    f"{solver:<14} total={est['total']:<6} aceitos={est['aceitos']:<6} "
+                    f"rejeitados={est['rejeitados']:<6} acurácia={est['acuracia'] * 100:5.1f}% "
+                    f"latência p50={est['p50']:.2f}s p95={est['p95']:.2f}s"
+                )
+        else:
+            total = store.exportar(args.destino, apenas_aceitos=not args.todos)
+            print(f"{total} amostras exportadas para {args.destino}")
+    finally:
+        store.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Taxas de aceitação de captcha por estratégia de resolução.
+
+Cada resposta enviada ao SEI é registrada com o solver que a produziu
+(``model``, ``tesseract``, ``2captcha`` ou ``ocr_fallback``), se foi aceita e,
+para os solvers locais, a confiança informada.  O resumo no log permite ajustar
+``captcha.min_confidence`` e ``captcha.model_min_confidence``: compare a confiança típica das respostas aceitas
+com a das rejeitadas.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .timing import percentil
+
+
+class CaptchaStats:
+    """Contadores thread-safe de respostas aceitas/rejeitadas pelo SEI."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aceitos: Dict[str, int] = defaultdict(int)
+        self._rejeitados: Dict[str, int] = defaultdict(int)
+        self._confiancas: Dict[bool, List[float]] = {True: [], False: []}
+        self._escaladas = 0
+
+    def registrar(self, estrategia: str, aceito: bool, confianca: Optional[float] = None) -> None:
+        with self._lock:
+            if aceito:
+                self._aceitos[estrategia] += 1
+            else:
+                self._rejeitados[estrategia] += 1
+            if confianca is not None:
+                self._confiancas[aceito].append(confianca)
+
+    def registrar_escalada(self) -> None:
+        """Conta um captcha em que um solver local não atingiu a confiança mínima."""
+        with self._lock:
+            self._escaladas += 1
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """Aceitos, rejeitados e taxa de aceitação por estratégia."""
+        with self._lock:
+            estrategias = set(self._aceitos) | set(self._rejeitados)
+            return {
+                nome: {
+                    "aceitos": self._aceitos[nome],
+                    "rejeitados": self._rejeitados[nome],
+                    "taxa": self._aceitos[nome] / (self._aceitos[nome] + self._rejeitados[nome]),
+                }
+                for nome in estrategias
+            }
+
+    def registrar_resumo(self, logger: logging.Logger) -> None:
+        for nome, est in sorted(self.resumo().items()):
+            logger.info(
+                f"Captcha [{nome}]: aceitos={est['aceitos']} rejeitados={est['rejeitados']} "
+                f"taxa={est['taxa'] * 100:.0f}%"
+            )
+        with self._lock:
+            escaladas = self._escaladas
+            aceitas = list(self._confiancas[True])
+            rejeitadas = list(self._confiancas[False])
+        if escaladas:
+            logger.info(f"Captcha: {escaladas} resposta(s) locais abaixo da confiança mínima")
+        if aceitas or rejeitadas:
+            logger.info(
+                f"Confiança dos solvers locais: aceitas p10={percentil(aceitas, 10):.0f} p50={percentil(aceitas, 50):.0f}; "
+                f"rejeitadas p50={percentil(rejeitadas, 50):.0f} p90={percentil(rejeitadas, 90):.0f}"
+            )
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._aceitos.clear()
+            self._rejeitados.clear()
+            self._confiancas = {True: [], False: []}
+            self._escaladas = 0
+
+
+# Instância compartilhada pela execução
+estatisticas_captcha = CaptchaStats()
@@ -0,0 +1,97 @@
+"""Checkpoint da execução para retomar rodadas interrompidas.
+
+Após cada processo o ``main`` grava um JSON compacto com o identificador da
+execução, os processos concluídos, os que falharam e a tentativa (rodada de
+retry) em andamento.  Se a execução for encerrada (tempo limite, ``kill``,
+queda da máquina), a próxima pode continuar de onde parou; ao terminar
+normalmente o checkpoint é removido.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from .process_state import gravar_json_atomico
+
+
+class RunCheckpoint:
+    """Progresso de uma execução, persistido em ``caminho``."""
+
+    def __init__(self, caminho: Path, logger: Optional[logging.Logger] = None,
+                 run_id: Optional[str] = None):
+        self.caminho = Path(caminho)
+        self.logger = logger or logging.getLogger(__name__)
+        self.run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self.atualizado = datetime.now()
+        self.concluidos: Set[str] = set()
+        self.falhas: Set[str] = set()
+        self.tentativa = 1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def carregar(cls, caminho: Path, logger: Optional[logging.Logger] = None) -> Optional["RunCheckpoint"]:
+        """Lê o checkpoint existente; ``None`` se não houver ou for inválido."""
+        caminho = Path(caminho)
+        if not caminho.exists():
+            return None
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            checkpoint = cls(caminho, logger, run_id=dados["run_id"])
+            checkpoint.atualizado = datetime.fromisoformat(dados["atualizado"])
+            checkpoint.concluidos = set(dados.get("concluidos", []))
+            checkpoint.falhas = set(dados.get("falhas", []))
+            checkpoint.tentativa = int(dados.get("tentativa", 1))
+            return checkpoint
+        except Exception as e:
+            (logger or logging.getLogger(__name__)).warning(f"Checkpoint ignorado ({caminho}): {e}")
+            return None
+
+    def idade_horas(self) -> float:
+        return (datetime.now() - self.atualizado).total_seconds() / 3600
+
+    def registrar(self, processo: str, sucesso: bool) -> None:
+        """Marca ``processo`` como concluído ou com falha e grava o checkpoint."""
+        with self._lock:
+            if sucesso:
+                self.concluidos.add(processo)
+                self.falhas.discard(processo)
+            else:
+                self.falhas.add(processo)
+        self.salvar()
+
+    def definir_tentativa(self, tentativa: int, falhas: Iterable[str]) -> None:
+        """Registra o início de uma rodada de retry com as falhas pendentes."""
+        with self._lock:
+            self.tentativa = tentativa
+            self.falhas = set(falhas) - self.concluidos
+        self.salvar()
+
+    def salvar(self) -> None:
+        with self._lock:
+            self.atualizado = datetime.now()
+            dados = {
+                "run_id": self.run_id,
+                "atualizado": self.atualizado.isoformat(timespec="seconds"),
+                "tentativa": self.tentativa,
+                "concluidos": sorted(self.concluidos),
+                "falhas": sorted(self.falhas),
+            }
+            try:
+                gravar_json_atomico(self.caminho, dados)
+            except Exception as e:
+                self.logger.warning(f"Erro ao salvar checkpoint: {e}")
+
+    def remover(self) -> None:
+        """Apaga o checkpoint ao final de uma execução completa."""
+        try:
+            self.caminho.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Erro ao remover checkpoint: {e}")
@@ -0,0 +1,88 @@
+"""Disjuntor (circuit breaker) para serviços externos.
+
+Depois de ``limite_falhas`` falhas consecutivas o circuito abre e as
+chamadas são recusadas na hora com :class:`CircuitoAberto`, sem esperar pelo
+erro do serviço.  A cada ``intervalo_sonda`` segundos uma única chamada de
+teste é liberada: se der certo o circuito fecha; se falhar, volta a abrir.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Optional
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+SONDANDO = "sondando"
+
+
+class CircuitoAberto(RuntimeError):
+    """Chamada recusada porque o circuito do serviço está aberto."""
+
+
+class CircuitBreaker:
+    """Estado thread-safe de um circuito compartilhado pelos workers."""
+
+    def __init__(self, nome: str, limite_falhas: int = 3, intervalo_sonda: float = 60,
+                 logger: Optional[logging.Logger] = None):
+        self.nome = nome
+        self.limite_falhas = max(1, int(limite_falhas))
+        self.intervalo_sonda = intervalo_sonda
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._estado = FECHADO
+        self._falhas = 0
+        self._reabrir_em = 0.0
+        self.motivo = ""
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado
+
+    def permitir(self) -> bool:
+        """Indica se uma chamada pode ser feita agora.
+
+        Com o circuito aberto e o intervalo vencido, libera uma única
+        chamada de sonda.
+        """
+        with self._lock:
+            if self._estado == FECHADO:
+                return True
+            if self._estado == ABERTO and time.monotonic() >= self._reabrir_em:
+                self._estado = SONDANDO
+                self.logger.info(f"{self.nome}: testando o serviço após circuito aberto ({self.motivo})")
+                return True
+            return False
+
+    def verificar(self) -> None:
+        """Como :meth:`permitir`, mas levanta :class:`CircuitoAberto`."""
+        if not self.permitir():
+            raise CircuitoAberto(f"{self.nome} indisponível: {self.motivo}")
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            if self._estado != FECHADO:
+                self.logger.info(f"{self.nome}: circuito fechado, serviço respondendo")
+            self._estado = FECHADO
+            self._falhas = 0
+            self.motivo = ""
+
+    def registrar_falha(self, motivo: str = "") -> None:
+        with self._lock:
+            self._falhas += 1
+            if self._estado == SONDANDO or self._falhas >= self.limite_falhas:
+                self._abrir(motivo or f"{self._falhas} falhas consecutivas", self.intervalo_sonda)
+
+    def abrir(self, motivo: str, duracao: Optional[float] = None) -> None:
+        """Abre o circuito imediatamente (ex.: saldo esgotado)."""
+        with self._lock:
+            self._abrir(motivo, self.intervalo_sonda if duracao is None else duracao)
+
+    def _abrir(self, motivo: str, duracao: float) -> None:
+        if self._estado != ABERTO:
+            self.logger.warning(f"{self.nome}: circuito aberto por {duracao:.0f}s ({motivo})")
+        self._estado = ABERTO
+        self.motivo = motivo
+        self._reabrir_em = time.monotonic() + duracao
@@ -0,0 +1,239 @@
+"""Motor de consulta ao SEI via HTTP direto, sem navegador.
+
+Reproduz o fluxo público de ``md_pesq_processo_pesquisar.php``: baixa o
+formulário e a imagem do captcha, envia a pesquisa, segue o link do processo e
+devolve o HTML da página, que o chamador extrai com :mod:`sei_aneel.sei_parser`.
+
+Cada worker usa sua própria :class:`requests.Session`, pois o captcha fica
+vinculado ao cookie de sessão do SEI, mas todas compartilham o mesmo
+:class:`~requests.adapters.HTTPAdapter`, reaproveitando as conexões abertas.
+
+Com um :class:`~sei_aneel.captcha_prefetch.CaptchaPrefetch`, ao abrir um
+processo o cliente já baixa o formulário seguinte e começa a resolver seu
+captcha, que fica pronto para a próxima pesquisa.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import retry
+from .captcha_prefetch import CaptchaPrefetch
+from .sei_parser import (
+    captcha_rejeitado,
+    criar_soup,
+    extrair_link_documento,
+)
+
+URL_PESQUISA = (
+    "https://sei.aneel.gov.br/sei/modulos/pesquisa/"
+    "md_pesq_processo_pesquisar.php?acao_externa=protocolo_pesquisar"
+    "&acao_origem_externa=protocolo_pesquisar&id_orgao_acesso_externo=0"
+)
+
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+class HttpEngineError(Exception):
+    """Falha no fluxo HTTP; o chamador deve recorrer ao Selenium."""
+
+
+def criar_adaptador(pool_maxsize: int = 10) -> HTTPAdapter:
+    """Adaptador com pool de conexões para ser compartilhado entre sessões."""
+    return HTTPAdapter(pool_connections=2, pool_maxsize=max(1, pool_maxsize))
+
+
+def _normalizar(numero: str) -> str:
+    return re.sub(r"\D", "", numero or "")
+
+
+def _campos_formulario(form) -> Dict[str, str]:
+    """Valores que o navegador enviaria para o formulário (exceto botões)."""
+    campos: Dict[str, str] = {}
+    for campo in form.find_all(["input", "select", "textarea"]):
+        nome = campo.get("name")
+        if not nome:
+            continue
+        tipo = (campo.get("type") or "").lower()
+        if campo.name == "input":
+            if tipo in ("submit", "button", "image", "reset", "file"):
+                continue
+            if tipo in ("checkbox", "radio") and not campo.has_attr("checked"):
+                continue
+            campos[nome] = campo.get("value", "on" if tipo in ("checkbox", "radio") else "")
+        elif campo.name == "select":
+            opcao = campo.find("option", selected=True) or campo.find("option")
+            campos[nome] = opcao.get("value", opcao.get_text()) if opcao else ""
+        else:
+            campos[nome] = campo.get_text()
+    return campos
+
+
+class SEIHttpClient:
+    """Consulta processos no SEI usando apenas requisições HTTP."""
+
+    def __init__(
+        self,
+        resolver_captcha: Callable[[bytes, int], str],
+        logger: Optional[logging.Logger] = None,
+        registrar_captcha: Optional[Callable[[bool], None]] = None,
+        adaptador: Optional[HTTPAdapter] = None,
+        timeout: float = 20,
+        max_tentativas_captcha: int = 5,
+        prefetch: Optional[CaptchaPrefetch] = None,
+    ):
+        self.resolver_captcha = resolver_captcha
+        self.prefetch = prefetch
+        # Recebe se o SEI aceitou a última resposta de captcha
+        self.registrar_captcha = registrar_captcha or (lambda aceito: None)
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout = timeout
+        self.max_tentativas_captcha = max_tentativas_captcha
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = _USER_AGENT
+        adaptador = adaptador or criar_adaptador()
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        resp = self.session.get(url, timeout=self.timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    @staticmethod
+    def _html(resp: requests.Response) -> str:
+        # O SEI nem sempre declara o charset no cabeçalho HTTP
+        if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
+            resp.encoding = resp.apparent_encoding or "iso-8859-1"
+        return resp.text
+
+    def _carregar_formulario(self):
+        """Baixa o formulário de pesquisa e a imagem do seu captcha.
+
+        Returns:
+            ``(form, url, captcha_bytes)``
+        """
+        resp = self._get(URL_PESQUISA)
+        soup = criar_soup(self._html(resp))
+
+        campo = soup.find(attrs={"name": "txtProtocoloPesquisa"})
+        form = campo.find_parent("form") if campo else None
+        img = soup.find(id="imgCaptcha")
+        if form is None or img is None or not img.get("src"):
+            raise HttpEngineError("formulário de pesquisa ou captcha não encontrado")
+
+        return form, resp.url, self._get(urljoin(resp.url, img["src"])).content
+
+    def _antecipar_captcha(self) -> None:
+        """Carrega o próximo formulário e começa a resolver seu captcha."""
+        if self.prefetch is None or not self.prefetch.deve_antecipar():
+            return
+        try:
+            form, url, captcha_bytes = self._carregar_formulario()
+        except (requests.RequestException, HttpEngineError) as e:
+            self.logger.debug(f"Captcha antecipado indisponível: {e}")
+            return
+        self.prefetch.iniciar(captcha_bytes, (form, url))
+
+    def _enviar_pesquisa(self, numero_processo: str, tentativa: int) -> Optional[Tuple[str, str]]:
+        """Resolve o captcha do formulário e retorna HTML e URL do resultado.
+
+        Usa o captcha antecipado, se houver um válido; senão carrega o
+        formulário agora.
+        """
+        antecipado = self.prefetch.obter() if self.prefetch else None
+        if antecipado:
+            captcha, (form, url_formulario) = antecipado
+            self.logger.debug("Usando captcha resolvido antecipadamente")
+        else:
+            form, url_formulario, captcha_bytes = self._carregar_formulario()
+            captcha = self.resolver_captcha(captcha_bytes, tentativa)
+            if not captcha:
+                return None
+
+        dados = _campos_formulario(form)
+        dados["txtProtocoloPesquisa"] = numero_processo
+        dados["txtInfraCaptcha"] = captcha
+        botao = form.find(id="sbmPesquisar")
+        if botao is not None and botao.get("name"):
+            dados[botao["name"]] = botao.get("value", "")
+
+        acao = urljoin(url_formulario, form.get("action") or url_formulario)
+        resultado = self.session.post(acao, data=dados, timeout=self.timeout)
+        resultado.raise_for_status()
+        return self._html(resultado), resultado.url
+
+    def buscar_pagina(self, numero_processo: str) -> Optional[Tuple[str, str]]:
+        """Pesquisa o processo e retorna ``(html, url)`` da sua página.
+
+        Retorna ``None`` se o processo não aparecer nos resultados. Captchas
+        recusados levam a nova pesquisa, conforme a política ``captcha`` de
+        :mod:`sei_aneel.retry`.
+
+        Raises:
+            HttpEngineError: Quando o fluxo HTTP não pôde ser concluído.
+        """
+        numero_processo = str(numero_processo).strip()
+        controle = retry.Retentativa(
+            "captcha", retry.POLITICAS["captcha"].com(tentativas=self.max_tentativas_captcha), self.logger
+        )
+        for tentativa in controle:
+            try:
+                return self._pesquisar(numero_processo, tentativa)
+            except retry.CaptchaRejeitadoError as e:
+                self.logger.info(f"Captcha não aceito na tentativa {tentativa} (HTTP): {e}")
+                if not controle.aguardar(retry.classificar(e), e):
+                    break
+            except requests.RequestException as e:
+                raise HttpEngineError(f"erro de rede: {e}") from e
+
+        raise HttpEngineError("captcha não aceito após múltiplas tentativas")
+
+    def _pesquisar(self, numero_processo: str, tentativa: int) -> Optional[Tuple[str, str]]:
+        """Uma pesquisa: ``(html, url)`` do processo ou ``None`` se não encontrado.
+
+        Raises:
+            retry.CaptchaRejeitadoError: Se o captcha não foi resolvido ou o
+                SEI o recusou.
+        """
+        resposta = self._enviar_pesquisa(numero_processo, tentativa)
+        if resposta is None:
+            raise retry.CaptchaRejeitadoError("captcha não resolvido")
+        html, url_resultado = resposta
+
+        alvo = _normalizar(numero_processo)
+        soup = criar_soup(html)
+        for link in soup.find_all("a"):
+            if _normalizar(link.get_text()) != alvo:
+                continue
+            url = extrair_link_documento(link.get("href", ""), link.get("onclick", ""), url_resultado)
+            if not url:
+                continue
+            self.registrar_captcha(True)
+            self.logger.info(f"Link do processo encontrado via HTTP: '{link.get_text().strip()}'")
+            try:
+                pagina = self._get(url)
+            except requests.RequestException as e:
+                raise HttpEngineError(f"erro ao abrir processo: {e}") from e
+            self._antecipar_captcha()
+            return self._html(pagina), pagina.url
+
+        rejeitado = captcha_rejeitado(html)
+        self.registrar_captcha(not rejeitado)
+        if rejeitado:
+            raise retry.CaptchaRejeitadoError("SEI recusou o captcha")
+        self.logger.warning(f"Processo {numero_processo} não encontrado nos resultados (HTTP)")
+        return None
+
+    def fechar(self) -> None:
+        if self.prefetch:
+            self.prefetch.fechar()
+        self.session.close()
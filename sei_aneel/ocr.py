@@ -0,0 +1,227 @@
+"""OCR local de captchas sem arquivos temporários.
+
+A imagem é tratada em memória com PIL e reconhecida por um de dois backends:
+
+* ``tesserocr`` (opcional): ligação direta com a libtesseract.  Cada thread
+  mantém uma instância de ``PyTessBaseAPI`` com o modelo já carregado, sem
+  custo de criação de processo por captcha.
+* ``subprocess``: a imagem é enviada ao executável do Tesseract pela entrada
+  padrão (``tesseract stdin stdout``) e o texto volta pela saída padrão.
+
+Com ``backend = "auto"`` (padrão) o ``tesserocr`` é usado quando instalado.
+Ambos usam o mesmo ``psm`` e a mesma lista de caracteres permitidos.
+
+Com NumPy disponível, :func:`reconhecer` roda o OCR sobre as variantes de
+:mod:`sei_aneel.captcha_preprocess` (no backend ``subprocess``, em processos
+paralelos) e escolhe a resposta por votação.
+"""
+from __future__ import annotations
+
+import io
+import subprocess
+import threading
+from collections import defaultdict
+from typing import List, Sequence, Tuple, Union
+
+from PIL import Image, ImageFilter, ImageOps
+
+try:  # libtesseract em processo, opcional
+    import tesserocr
+except Exception:  # pragma: no cover - depende do ambiente
+    tesserocr = None
+
+try:  # variantes vetorizadas exigem NumPy
+    from . import captcha_preprocess
+except Exception:  # pragma: no cover - depende do ambiente
+    captcha_preprocess = None
+
+# Caminho do executável; ``main`` ajusta conforme ``paths.tesseract``
+tesseract_cmd = "tesseract"
+# "auto", "tesserocr" ou "subprocess"; ``main`` ajusta conforme ``captcha.ocr_backend``
+backend = "auto"
+# "multi" (variantes + votação) ou "simples"; ``main`` ajusta conforme ``captcha.preprocess``
+preprocessamento = "multi"
+
+CARACTERES = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+PSM = 8  # palavra única
+
+_local = threading.local()
+
+
+class OCRError(Exception):
+    """Falha ao executar o Tesseract."""
+
+
+def carregar_imagem(imagem: Union[bytes, Image.Image]) -> Image.Image:
+    """Abre ``imagem`` (bytes PNG/JPEG ou ``Image``) sem tocar no disco."""
+    if isinstance(imagem, Image.Image):
+        return imagem
+    return Image.open(io.BytesIO(imagem))
+
+
+def preprocessar(img: Image.Image, limiar: int = 130) -> Image.Image:
+    """Escala de cinza, autocontraste, binarização e filtro de mediana."""
+    img = ImageOps.autocontrast(img.convert("L"))
+    img = img.point(lambda x: 255 if x > limiar else 0)
+    return img.filter(ImageFilter.MedianFilter(size=3))
+
+
+def para_png(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _comando(psm: int, saidas: Sequence[str]) -> List[str]:
+    return [
+        tesseract_cmd, "stdin", "stdout",
+        "--psm", str(psm),
+        "-c", f"tessedit_char_whitelist={CARACTERES}",
+        *saidas,
+    ]
+
+
+def executar_tesseract(png: bytes, *saidas: str, psm: int = PSM, timeout: float = 15) -> str:
+    """Roda o Tesseract sobre ``png`` via stdin e retorna a saída padrão.
+
+    ``saidas`` são configurações de saída adicionais do Tesseract (por
+    exemplo ``"tsv"``).
+    """
+    try:
+        resultado = subprocess.run(_comando(psm, saidas), input=png, capture_output=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise OCRError(f"erro ao executar tesseract: {e}") from e
+    if resultado.returncode != 0:
+        raise OCRError(resultado.stderr.decode("utf-8", "replace").strip() or "tesseract falhou")
+    return resultado.stdout.decode("utf-8", "replace")
+
+
+def executar_tesseract_lote(pngs: Sequence[bytes], *saidas: str, psm: int = PSM,
+                            timeout: float = 15) -> List[str]:
+    """Como :func:`executar_tesseract`, mas com um processo por imagem em paralelo.
+
+    Imagens cujo processo falhar resultam em ``""``; se todas falharem, o
+    erro é propagado.
+    """
+    processos = []
+    try:
+        for png in pngs:
+            processos.append(subprocess.Popen(
+                _comando(psm, saidas), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            ))
+    except OSError as e:
+        for processo in processos:
+            processo.kill()
+        raise OCRError(f"erro ao executar tesseract: {e}") from e
+
+    saidas_texto, erros = [], []
+    for processo, png in zip(processos, pngs):
+        try:
+            saida, erro = processo.communicate(png, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+            processo.communicate()
+            saida, erro = b"", b"timeout"
+        if processo.returncode != 0:
+            erros.append(erro.decode("utf-8", "replace").strip())
+            saida = b""
+        saidas_texto.append(saida.decode("utf-8", "replace"))
+    if erros and len(erros) == len(pngs):
+        raise OCRError(erros[0] or "tesseract falhou")
+    return saidas_texto
+
+
+def _ler_tsv(tsv: str) -> Tuple[str, float]:
+    """Texto e confiança mínima das palavras na saída TSV do Tesseract."""
+    palavras, confiancas = [], []
+    for linha in tsv.splitlines()[1:]:
+        colunas = linha.split("\t")
+        if len(colunas) < 12 or colunas[0] != "5":
+            continue
+        texto = "".join(filter(str.isalnum, colunas[11]))
+        try:
+            confianca = float(colunas[10])
+        except ValueError:
+            continue
+        if texto and confianca >= 0:
+            palavras.append(texto)
+            confiancas.append(confianca)
+    return "".join(palavras), (min(confiancas) if confiancas else 0.0)
+
+
+def usa_tesserocr() -> bool:
+    """Indica se o backend ``tesserocr`` está selecionado e disponível."""
+    if backend == "subprocess":
+        return False
+    if tesserocr is None:
+        if backend == "tesserocr":
+            raise OCRError("backend tesserocr selecionado, mas o pacote não está instalado")
+        return False
+    return True
+
+
+def _api():
+    """``PyTessBaseAPI`` da thread atual, criada na primeira chamada."""
+    api = getattr(_local, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(psm=PSM)
+        api.SetVariable("tessedit_char_whitelist", CARACTERES)
+        _local.api = api
+    return api
+
+
+def _reconhecer_tesserocr(img: Image.Image) -> Tuple[str, float]:
+    api = _api()
+    api.SetImage(img)
+    texto = "".join(filter(str.isalnum, api.GetUTF8Text()))
+    confiancas = [c for c in api.AllWordConfidences() if c >= 0]
+    return texto, (float(min(confiancas)) if confiancas and texto else 0.0)
+
+
+def votar(resultados: Sequence[Tuple[str, float]]) -> Tuple[str, float]:
+    """Escolhe a resposta mais frequente entre as variantes.
+
+    Empates são decididos pela soma das confianças.  Sem maioria absoluta
+    entre as respostas não vazias, a confiança é reduzida na proporção dos
+    votos recebidos.
+    """
+    votos = defaultdict(list)
+    for texto, confianca in resultados:
+        if texto:
+            votos[texto].append(confianca)
+    if not votos:
+        return "", 0.0
+    texto, confiancas = max(votos.items(), key=lambda item: (len(item[1]), sum(item[1])))
+    total = sum(len(c) for c in votos.values())
+    confianca = max(confiancas)
+    if len(confiancas) * 2 <= total and total > 1:
+        confianca *= len(confiancas) / total
+    return texto, confianca
+
+
+def _reconhecer_lote(imagens: Sequence[Image.Image]) -> List[Tuple[str, float]]:
+    if usa_tesserocr():
+        return [_reconhecer_tesserocr(img) for img in imagens]
+    return [_ler_tsv(tsv) for tsv in executar_tesseract_lote([para_png(img) for img in imagens], "tsv")]
+
+
+def reconhecer(imagem: Union[bytes, Image.Image]) -> Tuple[str, float]:
+    """Texto do captcha e a confiança do Tesseract (0-100).
+
+    A confiança é a menor entre as palavras reconhecidas, de modo que uma
+    única palavra duvidosa derruba o resultado inteiro.  No modo ``multi``
+    todas as variantes são reconhecidas e a resposta sai por votação.
+    """
+    img = carregar_imagem(imagem)
+    if preprocessamento == "multi" and captcha_preprocess is not None:
+        variantes = [variante for _, variante in captcha_preprocess.candidatos(img)]
+        return votar(_reconhecer_lote(variantes))
+    img = preprocessar(img)
+    if usa_tesserocr():
+        return _reconhecer_tesserocr(img)
+    return _ler_tsv(executar_tesseract(para_png(img), "tsv"))
+
+
+def ocr_captcha(imagem: Union[bytes, Image.Image]) -> str:
+    """Texto do captcha reconhecido localmente (apenas letras e dígitos)."""
+    return reconhecer(imagem)[0]
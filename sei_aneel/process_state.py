@@ -0,0 +1,166 @@
+"""Estado persistente por processo entre execuções.
+
+Guarda, para cada número de processo (apenas dígitos), a impressão digital
+dos andamentos vista na última extração completa, a data do andamento mais
+recente e as datas da última extração completa e do último sucesso.  O arquivo
+JSON é gravado de forma atômica e o acesso é protegido por lock para uso pelos
+workers paralelos.
+
+Esses dados também definem a ordem de processamento de cada execução (ver
+:meth:`ProcessStateStore.ordenar_por_prioridade`).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def gravar_json_atomico(caminho: Path, dados: Any) -> None:
+    """Grava ``dados`` em ``caminho`` via arquivo temporário + ``os.replace``."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, prefix=f".{caminho.stem}_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def _chave(numero: str) -> str:
+    return re.sub(r"\D", "", numero or "")
+
+
+def _data_mais_recente(impressao: str) -> Optional[str]:
+    """Maior data ``dd/mm/aaaa [hh:mm]`` contida na impressão digital, em ISO."""
+    datas = []
+    for dia, mes, ano, hora, minuto in re.findall(
+        r"(\d{2})/(\d{2})/(\d{4})(?:\s+(\d{2}):(\d{2}))?", impressao or ""
+    ):
+        try:
+            datas.append(datetime(int(ano), int(mes), int(dia), int(hora or 0), int(minuto or 0)))
+        except ValueError:
+            continue
+    return max(datas).isoformat(timespec="minutes") if datas else None
+
+
+def _ler_data(valor: Optional[str]) -> Optional[datetime]:
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        return None
+
+
+class ProcessStateStore:
+    """Armazena impressão digital e datas de sucesso de cada processo."""
+
+    def __init__(self, caminho: Path, logger: Optional[logging.Logger] = None):
+        self.caminho = Path(caminho)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._dados: Dict[str, Dict[str, Any]] = {}
+        self._alterado = False
+        self._carregar()
+
+    def _carregar(self) -> None:
+        if not self.caminho.exists():
+            return
+        try:
+            with open(self.caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            if isinstance(dados, dict):
+                self._dados = dados
+        except Exception as e:
+            self.logger.warning(f"Erro ao carregar estado dos processos: {e}")
+
+    def obter(self, numero: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._dados.get(_chave(numero), {}))
+
+    def inalterado(self, numero: str, impressao: str, dias_refresh: float) -> bool:
+        """Indica se ``impressao`` coincide com a última extração completa.
+
+        Retorna ``False`` quando não há impressão registrada ou quando a última
+        extração completa tem mais de ``dias_refresh`` dias.
+        """
+        estado = self.obter(numero)
+        if not impressao or estado.get("impressao") != impressao:
+            return False
+        ultima_completa = _ler_data(estado.get("ultima_completa"))
+        if ultima_completa is None:
+            return False
+        return datetime.now() - ultima_completa < timedelta(days=dias_refresh)
+
+    def registrar_sucesso(self, numero: str, impressao: Optional[str] = None,
+                          completa: bool = True) -> None:
+        """Registra um processamento bem-sucedido.
+
+        Args:
+            numero: Número do processo.
+            impressao: Impressão digital dos andamentos, se conhecida.
+            completa: ``True`` quando a página foi extraída e gravada por
+                inteiro; ``False`` quando o processo foi pulado por estar
+                inalterado.
+        """
+        agora = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            estado = self._dados.setdefault(_chave(numero), {})
+            estado["ultimo_sucesso"] = agora
+            if completa:
+                estado["ultima_completa"] = agora
+                if impressao:
+                    estado["impressao"] = impressao
+                    estado["ultimo_andamento"] = _data_mais_recente(impressao)
+            self._alterado = True
+
+    def ordenar_por_prioridade(self, processos: Sequence[str], dias_atividade: float = 7,
+                               horas_defasagem: float = 24) -> List[str]:
+        """Ordena ``processos`` para que execuções com tempo limitado avancem.
+
+        Ordem: nunca processados com sucesso; com andamento nos últimos
+        ``dias_atividade`` dias; sem sucesso há mais de ``horas_defasagem``
+        horas; demais.  Dentro de cada grupo vem primeiro quem está há mais
+        tempo sem sucesso, preservando a ordem original nos empates.
+        """
+        agora = datetime.now()
+        limite_atividade = agora - timedelta(days=dias_atividade)
+        limite_defasagem = agora - timedelta(hours=horas_defasagem)
+
+        def prioridade(numero: str) -> Tuple[int, datetime]:
+            estado = self.obter(numero)
+            ultimo_sucesso = _ler_data(estado.get("ultimo_sucesso"))
+            if ultimo_sucesso is None:
+                return 0, datetime.min
+            ultimo_andamento = _ler_data(estado.get("ultimo_andamento"))
+            if ultimo_andamento and ultimo_andamento >= limite_atividade:
+                return 1, ultimo_sucesso
+            if ultimo_sucesso < limite_defasagem:
+                return 2, ultimo_sucesso
+            return 3, ultimo_sucesso
+
+        return sorted(processos, key=prioridade)
+
+    def salvar(self) -> None:
+        """Grava o estado em disco se houver alterações."""
+        with self._lock:
+            if not self._alterado:
+                return
+            try:
+                gravar_json_atomico(self.caminho, self._dados)
+                self._alterado = False
+            except Exception as e:
+                self.logger.warning(f"Erro ao salvar estado dos processos: {e}")
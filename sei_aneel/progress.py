@@ -13,6 +13,7 @@ class ProgressTracker:
         self.failures = 0
         self.updates = 0
         self.inserts = 0
+        self.unchanged = 0
 
     def start(self, total_processes: int):
         self.start_time = datetime.now()
@@ -28,6 +29,9 @@ class ProgressTracker:
             self.inserts += 1
         elif status == "processado":
             self.successes += 1
+        elif status == "inalterado":
+            self.successes += 1
+            self.unchanged += 1
         else:
             self.failures += 1
 
@@ -53,6 +57,7 @@ class ProgressTracker:
         print(f"{Fore.WHITE}❌ Falhas: {Fore.RED}{self.failures}")
         print(f"{Fore.WHITE}🔄 Atualizações: {Fore.YELLOW}{self.updates}")
         print(f"{Fore.WHITE}📝 Inserções: {Fore.BLUE}{self.inserts}")
+        print(f"{Fore.WHITE}⏭️  Inalterados: {Fore.CYAN}{self.unchanged}")
         if self.processed > 0:
             success_rate = (self.successes / self.processed) * 100
             rate_color = Fore.GREEN if success_rate >= 80 else Fore.YELLOW if success_rate >= 60 else Fore.RED
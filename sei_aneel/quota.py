@@ -0,0 +1,134 @@
+"""Limite de requisições à API do Google Sheets.
+
+A API tem cotas por minuto, separadas para leitura e escrita.  Cada tipo tem
+um *token bucket* que recarrega ``por_minuto / 60`` fichas por segundo.
+Quem chega sem ficha disponível reserva a próxima e dorme até ela, de modo
+que threads concorrentes são atendidas em ordem, sem disputar a cota.  Um
+erro 429 pausa todas as chamadas pelo ``Retry-After`` informado (ou por
+``pausa_padrao`` segundos).
+
+Há uma instância por processo do sistema operacional, :data:`cota_planilha`,
+compartilhada pelos workers e pelas leituras das notificações do
+``PlanilhaHandler``.  ``manage_processes.py`` roda em outro processo e usa a
+sua própria instância: as cotas não são coordenadas entre os dois, e um 429
+causado pela soma das chamadas é tratado pela pausa e pelo retry.  Cada
+chamada à API conta uma ficha.  O tempo gasto esperando pela cota entra no
+resumo do log.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from . import retry
+
+LEITURA = "leitura"
+ESCRITA = "escrita"
+
+
+class TokenBucket:
+    """Balde de fichas com reserva: a espera é calculada sem segurar o lock."""
+
+    def __init__(self, por_minuto: float, capacidade: Optional[float] = None):
+        self.taxa = max(por_minuto, 1) / 60.0
+        # Rajada de ~10 s da cota: mantém a janela de um minuto dentro do limite
+        self.capacidade = capacidade or max(1.0, por_minuto / 6.0)
+        self._fichas = self.capacidade
+        self._atualizado = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reservar(self) -> float:
+        """Consome uma ficha e retorna quantos segundos esperar por ela."""
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado) * self.taxa)
+            self._atualizado = agora
+            self._fichas -= 1
+            return max(0.0, -self._fichas / self.taxa)
+
+
+class QuotaLimiter:
+    """Cotas de leitura e escrita com pausa compartilhada após erro 429."""
+
+    def __init__(self, leituras_por_minuto: float = 60, escritas_por_minuto: float = 60,
+                 pausa_padrao: float = 10):
+        self.pausa_padrao = pausa_padrao
+        self._lock = threading.Lock()
+        self._pausa_ate = 0.0
+        self.configurar(leituras_por_minuto, escritas_por_minuto)
+        self.limpar()
+
+    def configurar(self, leituras_por_minuto: float = 60, escritas_por_minuto: float = 60) -> None:
+        self._baldes = {LEITURA: TokenBucket(leituras_por_minuto), ESCRITA: TokenBucket(escritas_por_minuto)}
+
+    def pausar(self, segundos: float) -> None:
+        """Suspende todas as chamadas por ``segundos`` (a partir de agora)."""
+        with self._lock:
+            self._pausa_ate = max(self._pausa_ate, time.monotonic() + segundos)
+
+    def aguardar(self, tipo: str) -> float:
+        """Bloqueia até haver cota para uma chamada de ``tipo``; retorna a espera."""
+        espera = self._baldes[tipo].reservar()
+        with self._lock:
+            espera = max(espera, self._pausa_ate - time.monotonic())
+            self._chamadas[tipo] += 1
+            if espera > 0:
+                self._limitadas[tipo] += 1
+                self._espera[tipo] += espera
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def chamar(self, func: Callable[[], Any], tipo: str = LEITURA) -> Any:
+        """Executa ``func`` dentro da cota de ``tipo``.
+
+        Um erro de cota excedida pausa as próximas chamadas e é propagado
+        para a política de retry.
+        """
+        self.aguardar(tipo)
+        try:
+            return func()
+        except Exception as e:
+            if retry.classificar(e) == retry.COTA_EXCEDIDA:
+                pausa = retry.retry_after(e)
+                with self._lock:
+                    self._erros_cota += 1
+                self.pausar(self.pausa_padrao if pausa is None else pausa)
+            raise
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """Chamadas, chamadas que esperaram e segundos de espera por tipo."""
+        with self._lock:
+            return {
+                tipo: {
+                    "chamadas": self._chamadas[tipo],
+                    "limitadas": self._limitadas[tipo],
+                    "espera": self._espera[tipo],
+                }
+                for tipo in self._chamadas
+            }
+
+    def registrar_resumo(self, logger: logging.Logger) -> None:
+        for tipo, est in sorted(self.resumo().items()):
+            logger.info(
+                f"Cota Sheets [{tipo}]: chamadas={est['chamadas']} limitadas={est['limitadas']} "
+                f"espera={est['espera']:.1f}s"
+            )
+        with self._lock:
+            erros = self._erros_cota
+        if erros:
+            logger.warning(f"Cota Sheets: {erros} erro(s) 429 recebidos")
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._chamadas: Dict[str, int] = defaultdict(int)
+            self._limitadas: Dict[str, int] = defaultdict(int)
+            self._espera: Dict[str, float] = defaultdict(float)
+            self._erros_cota = 0
+
+
+# Instância compartilhada pela execução
+cota_planilha = QuotaLimiter()
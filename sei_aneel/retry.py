@@ -0,0 +1,232 @@
+"""Política de retry compartilhada por planilha, navegação e captcha.
+
+Cada falha é classificada em uma classe de erro, que define a espera antes
+da próxima tentativa:
+
+* ``captcha_rejeitado``: sem espera; basta um captcha novo;
+* ``elemento_ausente``: espera curta (página ainda carregando);
+* ``timeout_rede`` e ``outro``: espera da política da operação;
+* ``cota_excedida``: espera longa ou o ``Retry-After`` informado pelo serviço;
+* ``permanente`` (erros HTTP 4xx, exceto 429): não há nova tentativa.
+
+As esperas usam *decorrelated jitter* (``min(teto, uniforme(base, 3 x
+anterior))``), espalhando as novas tentativas dos workers.  Cada operação
+tem um limite de tentativas e um orçamento de tempo total, e nenhuma espera
+ultrapassa o prazo da execução definido com :func:`definir_prazo`.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+CAPTCHA_REJEITADO = "captcha_rejeitado"
+ELEMENTO_AUSENTE = "elemento_ausente"
+TIMEOUT_REDE = "timeout_rede"
+COTA_EXCEDIDA = "cota_excedida"
+PERMANENTE = "permanente"
+OUTRO = "outro"
+
+# Esperas fixas por classe (base, teto) em segundos; as demais usam a política
+_ESPERAS = {
+    CAPTCHA_REJEITADO: (0.0, 0.0),
+    ELEMENTO_AUSENTE: (0.2, 2.0),
+    COTA_EXCEDIDA: (10.0, 60.0),
+}
+
+_ELEMENTO = {
+    "NoSuchElementException",
+    "StaleElementReferenceException",
+    "ElementNotInteractableException",
+    "ElementClickInterceptedException",
+    "TimeoutException",  # WebDriverWait
+}
+_REDE = {"Timeout", "ConnectionError", "ReadTimeoutError", "ProtocolError", "NetworkException"}
+_COTA = ("quota", "resource_exhausted", "rate limit", "too many requests",
+         "error_no_slot_available", "error_zero_balance")
+
+_prazo: Optional[float] = None
+_lock = threading.Lock()
+
+
+class CaptchaRejeitadoError(Exception):
+    """O SEI recusou a resposta do captcha."""
+
+
+class Politica:
+    """Limites de uma operação: tentativas, orçamento total (s) e esperas (s)."""
+
+    def __init__(self, tentativas: int = 3, orcamento: float = 60.0, base: float = 1.0, teto: float = 20.0):
+        self.tentativas = max(1, int(tentativas))
+        self.orcamento = float(orcamento)
+        self.base = float(base)
+        self.teto = float(teto)
+
+    def com(self, **alteracoes) -> "Politica":
+        """Cópia com alguns limites alterados."""
+        valores = dict(tentativas=self.tentativas, orcamento=self.orcamento, base=self.base, teto=self.teto)
+        valores.update({chave: valor for chave, valor in alteracoes.items() if valor is not None})
+        return Politica(**valores)
+
+
+POLITICAS: Dict[str, Politica] = {
+    "padrao": Politica(tentativas=3, orcamento=60, base=1, teto=20),
+    "planilha": Politica(tentativas=4, orcamento=120, base=1, teto=30),
+    "navegacao": Politica(tentativas=3, orcamento=60, base=1, teto=10),
+    "captcha": Politica(tentativas=5, orcamento=180, base=0.5, teto=5),
+}
+
+
+def configurar(ajustes: Optional[Dict[str, Dict[str, float]]]) -> None:
+    """Aplica ``execution.retry`` (por operação: tentativas, orcamento, base, teto)."""
+    for operacao, valores in (ajustes or {}).items():
+        atual = POLITICAS.get(operacao, POLITICAS["padrao"])
+        POLITICAS[operacao] = atual.com(**{c: valores.get(c) for c in ("tentativas", "orcamento", "base", "teto")})
+
+
+def definir_prazo(limite: Optional[datetime]) -> None:
+    """Fim da execução (``tempo_limite``); ``None`` remove o prazo."""
+    global _prazo
+    with _lock:
+        _prazo = None if limite is None else time.monotonic() + (limite - datetime.now()).total_seconds()
+
+
+def tempo_restante() -> Optional[float]:
+    """Segundos até o prazo da execução, ou ``None`` sem prazo."""
+    with _lock:
+        return None if _prazo is None else _prazo - time.monotonic()
+
+
+def _status(erro: BaseException) -> Optional[int]:
+    resposta = getattr(erro, "response", None)
+    status = getattr(resposta, "status_code", None) or getattr(erro, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def classificar(erro: BaseException) -> str:
+    """Classe de erro de ``erro``, reconhecida pelo tipo, status HTTP ou mensagem."""
+    if isinstance(erro, CaptchaRejeitadoError):
+        return CAPTCHA_REJEITADO
+    nomes = {classe.__name__ for classe in type(erro).__mro__}
+    status = _status(erro)
+    mensagem = str(erro).lower()
+    if status == 429 or any(texto in mensagem for texto in _COTA):
+        return COTA_EXCEDIDA
+    if nomes & _ELEMENTO:
+        return ELEMENTO_AUSENTE
+    if isinstance(erro, (TimeoutError, ConnectionError, socket.timeout)) or nomes & _REDE:
+        return TIMEOUT_REDE
+    if status is not None and status >= 500:
+        return TIMEOUT_REDE
+    if status is not None and 400 <= status < 500:
+        return PERMANENTE
+    return OUTRO
+
+
+def retry_after(erro: BaseException) -> Optional[float]:
+    """Segundos pedidos pelo cabeçalho ``Retry-After`` da resposta, se houver."""
+    cabecalhos = getattr(getattr(erro, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(cabecalhos.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class Retentativa:
+    """Controle de um laço de tentativas de uma operação.
+
+    Uso::
+
+        controle = Retentativa("captcha")
+        for tentativa in controle:
+            ...
+            if not controle.aguardar(classe):
+                break
+    """
+
+    def __init__(self, operacao: str = "padrao", politica: Optional[Politica] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.operacao = operacao
+        self.politica = politica or POLITICAS.get(operacao, POLITICAS["padrao"])
+        self.logger = logger or logging.getLogger(__name__)
+        self.inicio = time.monotonic()
+        self.tentativa = 0
+        self.motivo = ""
+        self._anterior: Dict[str, float] = {}
+
+    def __iter__(self) -> Iterator[int]:
+        while self.tentativa < self.politica.tentativas:
+            self.tentativa += 1
+            yield self.tentativa
+
+    def _limites(self, classe: str) -> Tuple[float, float]:
+        return _ESPERAS.get(classe, (self.politica.base, self.politica.teto))
+
+    def espera(self, classe: str, erro: Optional[BaseException] = None) -> float:
+        """Próxima espera para ``classe`` (decorrelated jitter)."""
+        if erro is not None and classe == COTA_EXCEDIDA:
+            pedido = retry_after(erro)
+            if pedido is not None:
+                return pedido
+        base, teto = self._limites(classe)
+        if teto <= 0:
+            return 0.0
+        anterior = self._anterior.get(classe, base)
+        espera = min(teto, random.uniform(base, max(base, anterior * 3)))
+        self._anterior[classe] = espera
+        return espera
+
+    def pode_continuar(self, classe: str, espera: float) -> bool:
+        """Indica se cabe mais uma tentativa após ``espera``; senão preenche ``motivo``."""
+        restante = tempo_restante()
+        if classe == PERMANENTE:
+            self.motivo = "erro permanente"
+        elif self.tentativa >= self.politica.tentativas:
+            self.motivo = f"{self.politica.tentativas} tentativas"
+        elif time.monotonic() - self.inicio + espera > self.politica.orcamento:
+            self.motivo = f"orçamento de {self.politica.orcamento:.0f}s esgotado"
+        elif restante is not None and espera >= restante:
+            self.motivo = "prazo da execução atingido"
+        else:
+            return True
+        return False
+
+    def aguardar(self, classe: str, erro: Optional[BaseException] = None) -> bool:
+        """Espera antes da próxima tentativa; ``False`` se ela não deve ocorrer."""
+        espera = self.espera(classe, erro)
+        if not self.pode_continuar(classe, espera):
+            return False
+        if espera > 0:
+            time.sleep(espera)
+        return True
+
+
+def executar(func: Callable[[], Any], operacao: str = "padrao", politica: Optional[Politica] = None,
+             logger: Optional[logging.Logger] = None) -> Any:
+    """Executa ``func`` conforme a política de ``operacao``.
+
+    Raises:
+        Exception: A última exceção de ``func``, quando não há nova tentativa.
+    """
+    controle = Retentativa(operacao, politica, logger)
+    for tentativa in controle:
+        try:
+            return func()
+        except Exception as e:
+            classe = classificar(e)
+            espera = controle.espera(classe, e)
+            if not controle.pode_continuar(classe, espera):
+                controle.logger.error(
+                    f"Falha em {operacao} ({classe}) após {tentativa} tentativa(s), {controle.motivo}: {e}"
+                )
+                raise
+            controle.logger.warning(
+                f"Erro em {operacao} ({classe}) na tentativa {tentativa}/{controle.politica.tentativas}, "
+                f"tentando novamente em {espera:.1f}s: {e}"
+            )
+            if espera > 0:
+                time.sleep(espera)
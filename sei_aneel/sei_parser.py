@@ -0,0 +1,230 @@
+"""Parser em passagem única das páginas de processo do SEI.
+
+Extrai cabeçalho, documentos e andamentos a partir do HTML completo da página
+(``driver.page_source``), evitando uma chamada WebDriver por célula.  O texto
+é normalizado de forma semelhante ao ``.text`` do Selenium: quebras de linha
+de ``<br>`` são preservadas e espaços repetidos são colapsados.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:  # lxml é bem mais rápido, mas opcional
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except Exception:  # pragma: no cover - depende do ambiente
+    _PARSER = "html.parser"
+
+
+class ParserError(Exception):
+    """Página não corresponde à estrutura esperada de um processo do SEI."""
+
+
+def criar_soup(html: str) -> BeautifulSoup:
+    """Cria a árvore do documento usando o parser mais rápido disponível."""
+    return BeautifulSoup(html or "", _PARSER)
+
+
+def _texto(elemento) -> str:
+    """Texto do elemento com espaços colapsados por linha."""
+    for br in elemento.find_all("br"):
+        br.replace_with("\n")
+    linhas = (" ".join(linha.split()) for linha in elemento.get_text().splitlines())
+    return "\n".join(linha for linha in linhas if linha)
+
+
+def _celulas(linha) -> list:
+    return linha.find_all("td", recursive=False) or linha.find_all("td")
+
+
+def extrair_link_documento(href: str, onclick: str, base_url: str) -> str:
+    """Obtém o link real do documento a partir de ``href``/``onclick``.
+
+    Quando o ``href`` é uma chamada JavaScript, procura URLs no ``onclick`` e
+    retorna a última encontrada, que geralmente corresponde ao documento.
+    """
+    if href and not href.lower().startswith("javascript"):
+        return urljoin(base_url, href)
+
+    if onclick:
+        candidatos = re.findall(
+            r"['\"](https?://[^'\"]+|/[^'\"]+|\w+\.php[^'\"]*)['\"]",
+            onclick,
+        )
+        for url in reversed(candidatos):
+            if url.lower().startswith("javascript"):
+                continue
+            return urljoin(base_url, url)
+    return ""
+
+
+def buscar_interessados_html(html: str) -> str:
+    """Busca interessados diretamente no HTML quando a extração padrão falhar."""
+    match = re.search(r"Interessad[oa]s?</td>\s*<td[^>]*>(.*?)</td>", html or "", re.IGNORECASE | re.DOTALL)
+    if match:
+        texto = re.sub(r"<[^>]+>", "", match.group(1))
+        return re.sub(r"\s+", " ", texto).strip()
+    return ""
+
+
+_CAPTCHA_INVALIDO = re.compile(
+    r"(c[óo]digo\s+de\s+confirma[çc][ãa]o|captcha)[^<]{0,40}inv[áa]lid",
+    re.IGNORECASE,
+)
+
+
+def captcha_rejeitado(html: str) -> bool:
+    """Indica se a resposta da pesquisa contém a mensagem de captcha inválido."""
+    return bool(_CAPTCHA_INVALIDO.search(html or ""))
+
+
+_LINHA_ANDAMENTO = re.compile(
+    r"<tr[^>]*class=[\"'][^\"']*andamento[^>]*>\s*<td[^>]*>(.*?)</td>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def impressao_andamentos(html: str) -> str:
+    """Impressão digital barata dos andamentos: quantidade e datas extremas.
+
+    Usa apenas uma busca textual no HTML, sem montar a árvore do documento,
+    para decidir se vale a pena extrair e gravar o processo novamente.
+    Retorna ``""`` se nenhum andamento for encontrado.
+    """
+    datas = [
+        " ".join(re.sub(r"<[^>]+>", " ", data).split())
+        for data in _LINHA_ANDAMENTO.findall(html or "")
+    ]
+    if not datas:
+        return ""
+    return f"{len(datas)}|{datas[0]}|{datas[-1]}"
+
+
+def _interessados(td) -> str:
+    lista = []
+    for elem in td.find_all(True):
+        texto = _texto(elem)
+        if texto and texto not in lista:
+            lista.append(texto)
+    return "; ".join(lista)
+
+
+def parse_detalhes(soup: BeautifulSoup) -> Dict[str, str]:
+    """Extrai os pares chave/valor da tabela ``tblCabecalho``."""
+    tabela = soup.find(id="tblCabecalho")
+    if tabela is None:
+        raise ParserError("tblCabecalho não encontrada")
+
+    dados: Dict[str, str] = {}
+    for linha in tabela.find_all("tr"):
+        tds = _celulas(linha)
+        if len(tds) != 2:
+            continue
+        chave = _texto(tds[0]).replace(":", "")
+        if chave.lower().startswith("interessado"):
+            valor = _interessados(tds[1]) or _texto(tds[1]).replace("\n", " ")
+            dados["Interessados"] = valor
+        else:
+            dados[chave] = _texto(tds[1]).replace("\n", " ")
+    return dados
+
+
+def _linhas_documentos(tabela, base_url: str) -> Tuple[int, List[Tuple[str, ...]]]:
+    """Linhas de dados de ``tblDocumentos`` e os documentos extraídos delas.
+
+    Linhas com uma única célula (mensagens como "nenhum documento") não
+    contam como dados.
+    """
+    documentos = []
+    dados = 0
+    for linha in tabela.find_all("tr")[1:]:  # Pula cabeçalho
+        tds = _celulas(linha)
+        if len(tds) > 1:
+            dados += 1
+        if len(tds) < 6:
+            continue
+        link = tds[1].find("a")
+        documentos.append(tuple(_texto(td) for td in tds[1:6]) + (
+            extrair_link_documento(link.get("href", ""), link.get("onclick", ""), base_url) if link else "",
+        ))
+    return dados, documentos
+
+
+def _linhas_andamentos(soup: BeautifulSoup) -> Tuple[int, List[Tuple[str, str, str]]]:
+    """Linhas ``tr`` com classe ``andamento`` e os andamentos extraídos delas."""
+    andamentos = []
+    linhas = soup.find_all(lambda tag: tag.name == "tr" and "andamento" in " ".join(tag.get("class", [])))
+    for linha in linhas:
+        tds = _celulas(linha)
+        if len(tds) == 3:
+            andamentos.append((_texto(tds[0]), _texto(tds[1]), _texto(tds[2])))
+    return len(linhas), andamentos
+
+
+def _colunas(linhas: List[tuple], quantidade: int) -> tuple:
+    """Junta cada coluna em um texto separado por quebras de linha."""
+    return tuple("\n".join(linha[i] for linha in linhas) for i in range(quantidade))
+
+
+def parse_documentos(soup: BeautifulSoup, base_url: str) -> Tuple[str, str, str, str, str, str]:
+    """Extrai a lista de documentos da tabela ``tblDocumentos``."""
+    tabela = soup.find(id="tblDocumentos")
+    if tabela is None:
+        return "", "", "", "", "", ""
+    return _colunas(_linhas_documentos(tabela, base_url)[1], 6)  # type: ignore[return-value]
+
+
+def parse_andamentos(soup: BeautifulSoup) -> Tuple[str, str, str]:
+    """Extrai os andamentos (linhas ``tr`` com classe ``andamento``)."""
+    return _colunas(_linhas_andamentos(soup)[1], 3)  # type: ignore[return-value]
+
+
+def parse_pagina_processo(html: str, base_url: str) -> Dict[str, tuple]:
+    """Extrai todos os dados da página do processo em uma única passagem.
+
+    Returns:
+        Dicionário com ``detalhes`` (dict), ``documentos`` (6 colunas) e
+        ``andamentos`` (3 colunas), no mesmo formato dos extratores Selenium.
+
+    Raises:
+        ParserError: Se a página não passar na validação estrutural.
+    """
+    interessados_html = buscar_interessados_html(html)
+    soup = criar_soup(html)
+    detalhes = parse_detalhes(soup)
+    if not detalhes.get("Processo"):
+        raise ParserError("número do processo ausente no cabeçalho")
+    if not detalhes.get("Interessados") and interessados_html:
+        detalhes["Interessados"] = interessados_html
+
+    tabela = soup.find(id="tblDocumentos")
+    if "tblDocumentos" in html and tabela is None:
+        raise ParserError("tblDocumentos presente no HTML mas não reconhecida")
+    documentos: List[Tuple[str, ...]] = []
+    if tabela is not None:
+        linhas_doc, documentos = _linhas_documentos(tabela, base_url)
+        # Toda linha de dados precisa virar um documento com número e data
+        if len(documentos) != linhas_doc:
+            raise ParserError(f"{linhas_doc} linhas em tblDocumentos, {len(documentos)} documentos extraídos")
+        for doc in documentos:
+            if not doc[0] or not doc[2]:
+                raise ParserError(f"documento sem número ou data: {doc[:3]}")
+
+    linhas_and, andamentos = _linhas_andamentos(soup)
+    # Confere a contagem com a árvore e com uma busca textual independente
+    esperados = len(re.findall(r"<tr[^>]*class=[\"'][^\"']*andamento", html, re.IGNORECASE))
+    if len(andamentos) != linhas_and or (esperados and len(andamentos) != esperados):
+        raise ParserError(f"{max(esperados, linhas_and)} andamentos no HTML, {len(andamentos)} extraídos")
+    for andamento in andamentos:
+        if not andamento[0] or not andamento[2]:
+            raise ParserError(f"andamento sem data ou descrição: {andamento}")
+
+    return {
+        "detalhes": detalhes,
+        "documentos": _colunas(documentos, 6),
+        "andamentos": _colunas(andamentos, 3),
+    }
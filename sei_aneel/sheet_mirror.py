@@ -0,0 +1,177 @@
+"""Espelho local da planilha de processos.
+
+Um banco SQLite guarda os valores exibidos de cada linha da aba, junto com a
+revisão da planilha (``modifiedTime`` do arquivo no Google Drive) em que a
+cópia foi feita.  As escritas do próprio ``PlanilhaHandler`` são aplicadas
+ao espelho a partir da resposta da API (``updatedData``), e as leituras da
+planilha inteira (notificações e tabela completa) passam a ser respondidas
+localmente enquanto a revisão remota não mudar por outra fonte.
+
+A revisão remota muda também com as nossas escritas.  Por isso a revisão é
+consultada logo antes e logo depois de cada escrita: se a de antes é a do
+espelho, ninguém mais alterou a planilha e o espelho passa para a revisão de
+depois; senão ele é invalidado e a próxima leitura baixa a planilha.  Uma
+cópia completa também é forçada após ``idade_maxima`` segundos.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS linhas (
+    linha INTEGER PRIMARY KEY,
+    valores TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+
+def caminho_padrao() -> Path:
+    """Banco em ``data/`` seguindo a mesma convenção do script principal."""
+    if platform.system() == "Windows":
+        return Path(os.getcwd()) / "data" / "sheet_mirror.sqlite"
+    return Path("/opt/sei-aneel/data/sheet_mirror.sqlite")
+
+
+def _instante(texto: Optional[str]) -> Optional[datetime]:
+    """Converte um horário RFC 3339 (``2024-05-01T12:00:00.000Z``) em UTC."""
+    if not texto:
+        return None
+    try:
+        instante = datetime.fromisoformat(texto.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return instante if instante.tzinfo else instante.replace(tzinfo=timezone.utc)
+
+
+class EspelhoPlanilha:
+    """Cópia SQLite dos valores de uma aba, segura para várias threads.
+
+    Args:
+        caminho: Arquivo do banco; por padrão ``data/sheet_mirror.sqlite``.
+        origem: Identificação da aba (planilha e aba); um espelho de outra
+            origem é descartado.
+        idade_maxima: Segundos após a última cópia completa em que o
+            espelho ainda pode ser usado.
+    """
+
+    def __init__(self, caminho: Optional[Path] = None, origem: str = "",
+                 idade_maxima: float = 21600, logger: Optional[logging.Logger] = None):
+        self.caminho = Path(caminho or caminho_padrao())
+        self.idade_maxima = idade_maxima
+        self.logger = logger or logging.getLogger(__name__)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conexao.executescript(_ESQUEMA)
+        if self._meta("origem") != origem:
+            with self._lock, self._conexao:
+                self._conexao.execute("DELETE FROM linhas")
+                self._conexao.execute("DELETE FROM meta")
+                self._definir_meta(origem=origem)
+
+    def _meta(self, chave: str) -> Optional[str]:
+        with self._lock:
+            linha = self._conexao.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def _definir_meta(self, **valores: Optional[str]) -> None:
+        # Chamado com o lock e a transação já abertos
+        self._conexao.executemany(
+            "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", list(valores.items())
+        )
+
+    @property
+    def revisao(self) -> Optional[str]:
+        """Revisão remota em que o espelho está, ou ``None`` se inválido."""
+        return self._meta("revisao")
+
+    def valores(self, revisao_remota: Optional[str]) -> Optional[List[List[str]]]:
+        """Linhas da aba, se o espelho estiver em dia com ``revisao_remota``.
+
+        Retorna ``None`` quando é preciso baixar a planilha: espelho inválido
+        ou antigo, revisão remota diferente da do espelho ou linhas faltando.
+        """
+        revisao = self.revisao
+        if not revisao or revisao != revisao_remota:
+            return None
+        sincronizado = _instante(self._meta("sincronizado_em"))
+        if sincronizado is None or datetime.now(timezone.utc) - sincronizado > timedelta(seconds=self.idade_maxima):
+            return None
+
+        with self._lock:
+            linhas = self._conexao.execute("SELECT linha, valores FROM linhas ORDER BY linha").fetchall()
+        if [linha for linha, _ in linhas] != list(range(1, len(linhas) + 1)):
+            self.logger.info("Espelho da planilha com linhas faltando; baixando a planilha")
+            return None
+        valores = [json.loads(texto) for _, texto in linhas]
+        # Mesmo formato de get_all_values: todas as linhas com a mesma largura
+        largura = max((len(linha) for linha in valores), default=0)
+        return [linha + [""] * (largura - len(linha)) for linha in valores]
+
+    def substituir(self, valores: List[List[str]], revisao: Optional[str]) -> None:
+        """Troca todo o conteúdo por uma cópia completa da planilha."""
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute("DELETE FROM linhas")
+                self._conexao.executemany(
+                    "INSERT INTO linhas (linha, valores) VALUES (?, ?)",
+                    [(idx, json.dumps(linha, ensure_ascii=False)) for idx, linha in enumerate(valores, start=1)],
+                )
+                self._definir_meta(revisao=revisao, sincronizado_em=datetime.now(timezone.utc).isoformat())
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erro ao gravar o espelho da planilha: {e}")
+
+    def gravar_linhas(self, linhas: Dict[int, List[str]], revisao_antes: Optional[str],
+                      revisao_depois: Optional[str]) -> bool:
+        """Aplica linhas gravadas na planilha (número da linha → valores exibidos).
+
+        ``revisao_antes`` e ``revisao_depois`` são as revisões remotas lidas
+        logo antes e logo depois da escrita.  O espelho só acompanha a
+        planilha se a de antes for a sua; senão outra fonte a alterou e o
+        espelho é invalidado.
+
+        Returns:
+            ``False`` se o espelho foi invalidado.
+        """
+        revisao = self.revisao
+        if not revisao or revisao_antes != revisao or not revisao_depois:
+            if revisao:
+                self.logger.info("Planilha alterada por outra fonte; o espelho será recarregado")
+            self.invalidar()
+            return False
+        try:
+            with self._lock, self._conexao:
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO linhas (linha, valores) VALUES (?, ?)",
+                    [(idx, json.dumps(valores, ensure_ascii=False)) for idx, valores in linhas.items()],
+                )
+                self._definir_meta(revisao=revisao_depois)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erro ao atualizar o espelho da planilha: {e}")
+            self.invalidar()
+            return False
+        return True
+
+    def invalidar(self) -> None:
+        """Força a próxima leitura a baixar a planilha inteira."""
+        try:
+            with self._lock, self._conexao:
+                self._definir_meta(revisao=None)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erro ao invalidar o espelho da planilha: {e}")
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._conexao.close()
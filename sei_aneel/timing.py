@@ -0,0 +1,83 @@
+"""Medição de latência por etapa do processamento.
+
+O objeto :data:`latencias` é compartilhado por toda a execução (inclusive entre
+workers paralelos) e acumula a duração de cada etapa nomeada, permitindo
+registrar no log um resumo com contagem, média e percentis.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+
+def percentil(valores: Sequence[float], p: float) -> float:
+    """Percentil ``p`` (0-100) por interpolação linear; ``0.0`` se vazio."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = math.floor(posicao)
+    superior = math.ceil(posicao)
+    if inferior == superior:
+        return ordenados[int(posicao)]
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+class LatencyLog:
+    """Acumula durações (em segundos) por etapa de forma thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._amostras: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """Mede o tempo gasto no bloco ``with`` e o registra em ``nome``."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, time.perf_counter() - inicio)
+
+    def registrar(self, nome: str, segundos: float) -> None:
+        with self._lock:
+            self._amostras[nome].append(segundos)
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """Estatísticas por etapa: quantidade, total, média, p50, p95 e máximo."""
+        with self._lock:
+            copia = {nome: list(valores) for nome, valores in self._amostras.items()}
+        return {
+            nome: {
+                "quantidade": len(valores),
+                "total": sum(valores),
+                "media": sum(valores) / len(valores),
+                "p50": percentil(valores, 50),
+                "p95": percentil(valores, 95),
+                "max": max(valores),
+            }
+            for nome, valores in copia.items()
+            if valores
+        }
+
+    def registrar_resumo(self, logger: logging.Logger) -> None:
+        """Escreve no log uma linha por etapa com as estatísticas acumuladas."""
+        for nome, est in sorted(self.resumo().items()):
+            logger.info(
+                f"Latência [{nome}]: n={est['quantidade']} total={est['total']:.1f}s "
+                f"média={est['media']:.2f}s p50={est['p50']:.2f}s "
+                f"p95={est['p95']:.2f}s máx={est['max']:.2f}s"
+            )
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._amostras.clear()
+
+
+# Instância compartilhada pela execução
+latencias = LatencyLog()
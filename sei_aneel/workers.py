@@ -0,0 +1,147 @@
+"""Pool de workers para processar itens em paralelo.
+
+Cada worker mantém um *contexto* próprio (por exemplo, uma instância do
+navegador) que é criado uma única vez e reutilizado entre chamadas de
+:meth:`WorkerPool.executar`.  Os itens são consumidos de uma fila
+compartilhada e os callbacks de conclusão são serializados por um lock, de modo
+que estatísticas e conjuntos de resultados podem ser atualizados sem
+sincronização adicional.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class WorkerPool:
+    """Executa uma função sobre itens usando ``num_workers`` contextos."""
+
+    def __init__(
+        self,
+        num_workers: int,
+        criar_contexto: Callable[[], Any],
+        fechar_contexto: Optional[Callable[[Any], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.num_workers = max(1, int(num_workers))
+        self._criar_contexto = criar_contexto
+        self._fechar_contexto = fechar_contexto
+        self.logger = logger or logging.getLogger(__name__)
+        self._contextos: List[Any] = [None] * self.num_workers
+        self._lock = threading.Lock()
+        # Fila e condição de parada da execução em andamento
+        self._fila: Optional["queue.Queue[Any]"] = None
+        self._deve_parar: Optional[Callable[[], bool]] = None
+
+    @property
+    def paralelo(self) -> bool:
+        return self.num_workers > 1
+
+    def ha_pendentes(self) -> bool:
+        """Indica se a execução em andamento ainda vai iniciar algum item.
+
+        Permite ao worker evitar trabalho antecipado (como resolver o próximo
+        captcha) depois do último item.
+        """
+        fila, deve_parar = self._fila, self._deve_parar
+        if fila is None or fila.empty():
+            return False
+        return not (deve_parar and deve_parar())
+
+    def iniciar(self) -> None:
+        """Cria o contexto do primeiro worker, propagando falhas de inicialização.
+
+        Os demais contextos são criados sob demanda pelas próprias threads, o
+        que permite inicializar os navegadores em paralelo.
+        """
+        self._obter_contexto(0)
+
+    def _obter_contexto(self, indice: int) -> Any:
+        if self._contextos[indice] is None:
+            self._contextos[indice] = self._criar_contexto()
+        return self._contextos[indice]
+
+    def executar(
+        self,
+        itens: Iterable[Any],
+        funcao: Callable[[Any, Any], Any],
+        deve_parar: Optional[Callable[[], bool]] = None,
+        ao_concluir: Optional[Callable[[Any, Any], None]] = None,
+    ) -> List[Any]:
+        """Processa ``itens`` chamando ``funcao(contexto, item)``.
+
+        Args:
+            itens: Itens a processar, consumidos na ordem fornecida.
+            funcao: Função executada para cada item.
+            deve_parar: Verificada antes de cada item; quando retorna ``True``
+                nenhum item novo é iniciado.
+            ao_concluir: Chamado com ``(item, resultado)`` após cada item,
+                sempre sob o lock do pool.
+
+        Returns:
+            Lista de itens que não chegaram a ser iniciados.
+        """
+        fila: "queue.Queue[Any]" = queue.Queue()
+        for item in itens:
+            fila.put(item)
+        self._fila, self._deve_parar = fila, deve_parar
+
+        def worker(indice: int) -> None:
+            try:
+                contexto = self._obter_contexto(indice)
+            except Exception as e:
+                self.logger.error(f"Falha ao inicializar worker {indice + 1}: {e}")
+                return
+            while True:
+                if deve_parar and deve_parar():
+                    return
+                try:
+                    item = fila.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    resultado = funcao(contexto, item)
+                except Exception as e:
+                    self.logger.error(f"Erro no worker {indice + 1} ao processar {item}: {e}")
+                    continue
+                if ao_concluir:
+                    with self._lock:
+                        ao_concluir(item, resultado)
+
+        try:
+            if not self.paralelo:
+                # Executa na thread atual para preservar pausa e modo passo-a-passo
+                worker(0)
+            else:
+                threads = [
+                    threading.Thread(target=worker, args=(i,), name=f"sei-worker-{i + 1}", daemon=True)
+                    for i in range(self.num_workers)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            self._fila, self._deve_parar = None, None
+
+        pendentes = []
+        while True:
+            try:
+                pendentes.append(fila.get_nowait())
+            except queue.Empty:
+                break
+        return pendentes
+
+    def fechar(self) -> None:
+        """Libera todos os contextos criados."""
+        for indice, contexto in enumerate(self._contextos):
+            if contexto is None:
+                continue
+            if self._fechar_contexto:
+                try:
+                    self._fechar_contexto(contexto)
+                except Exception as e:
+                    self.logger.warning(f"Erro ao encerrar worker {indice + 1}: {e}")
+            self._contextos[indice] = None
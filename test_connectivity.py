@@ -4,20 +4,18 @@
 import argparse
 import json
 import smtplib
-import urllib.request
 
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
+from sei_aneel.captcha_pipeline import consultar_saldo
 from sei_aneel.config import load_config
 
 
 def check_twocaptcha(api_key):
     """Testa a conectividade com o serviço 2captcha."""
     try:
-        url = f'https://2captcha.com/res.php?key={api_key}&action=getbalance'
-        with urllib.request.urlopen(url, timeout=10) as resp:
-            balance = resp.read().decode().strip()
+        balance = consultar_saldo(api_key)
         print(f'2captcha: OK - saldo {balance}')
     except Exception as e:
         print(f'2captcha: {e}')